@@ -2,27 +2,40 @@ import sys
 import os
 import time
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'user-interface'))
-import ui
-
 #batas bawah versi py
 REQUIRED_MAJOR = 3
 REQUIRED_MINOR = 14
 
-#get version py
-version = sys.version_info
-#cek versi
-if (version.major < REQUIRED_MAJOR) or (version.major == REQUIRED_MAJOR and version.minor < REQUIRED_MINOR):
-    print(f"Detected Python version: {version.major}.{version.minor}.{version.micro}")
-    print(f"Python 3.14 atau lebih baru diperlukan!")
-    confirm = input("Apakah anda yakin ingin menjalankan program ini dengan resiko program tidak berjalan / crash (y/n): ")
-    if confirm == 'y':
-        ui.show_menu()
-    else:
-        print("Program akan ditutup dalam 3 detik")
-        time.sleep(3)
-        os.system('cls')
+def run_menu():
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'user-interface'))
+    import ui
+    from console import clear
 
-else:
-    ui.show_menu()
+    #get version py
+    version = sys.version_info
+    #cek versi
+    if (version.major < REQUIRED_MAJOR) or (version.major == REQUIRED_MAJOR and version.minor < REQUIRED_MINOR):
+        print(f"Detected Python version: {version.major}.{version.minor}.{version.micro}")
+        print(f"Python 3.14 atau lebih baru diperlukan!")
+        confirm = input("Apakah anda yakin ingin menjalankan program ini dengan resiko program tidak berjalan / crash (y/n): ")
+        if confirm == 'y':
+            ui.show_menu()
+        else:
+            print("Program akan ditutup dalam 3 detik")
+            time.sleep(3)
+            clear()
+
+    else:
+        ui.show_menu()
 
+#dijaga __main__: worker ProcessPoolExecutor (spawn di Windows/macOS) meng-import ulang modul ini
+if __name__ == "__main__":
+    #ada argumen: jalankan perintah headless (utils.cli) tanpa memuat console/tkinter
+    if len(sys.argv) > 1:
+        from utils.cli import main
+        sys.exit(main(sys.argv[1:]))
+    #stdin ditutup (EOF dari console/input): keluar tanpa traceback
+    try:
+        run_menu()
+    except EOFError:
+        sys.exit(0)
@@ -0,0 +1,139 @@
+"""Benchmark jalur penyimpanan dan penjadwalan MemoRA pada deck sintetis.
+
+Contoh:
+    python -m benchmarks.run --sizes 1000,10000,100000 --out bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+#data benchmark tidak boleh menyentuh folder data pengguna
+if "MEMORA_DATA_DIR" not in os.environ:
+    os.environ["MEMORA_DATA_DIR"] = tempfile.mkdtemp(prefix="memora-bench-")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils.deck as deck
+import utils.cards as cards
+from utils.writer import WriteBehind
+from benchmarks.synthetic import synthetic_cards
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent.parent)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+#menjalankan fn dan mengembalikan (detik, peak memori MB); memori diukur pada putaran terpisah
+def _measure(fn, setup=None, memory=True):
+    if setup is not None:
+        setup()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return seconds, peak
+
+def bench_size(size: int, ratings: int, memory: bool) -> list:
+    name = f"bench {size}"
+    now = cards._now_ts()
+    raw = synthetic_cards(size, now)
+    deck.create_deck(name)
+    deck.save_deck(name, raw)
+    results = []
+
+    def record(op, fn, ops=1, setup=None):
+        seconds, peak = _measure(fn, setup, memory)
+        results.append({"size": size, "op": op, "ops": ops, "seconds": round(seconds, 6),
+                        "throughput": round(ops / seconds, 2) if seconds > 0 else None,
+                        "peak_mb": None if peak is None else round(peak, 3)})
+
+    record("save_deck", lambda: deck.save_deck(name, raw), ops=size)
+    record("load_deck_cold", lambda: deck.load_deck(name), ops=size, setup=deck.clear_cache)
+    deck.load_deck(name)
+    record("load_deck_cached", lambda: deck.load_deck(name), ops=size)
+    record("card_queue_cold", lambda: cards.card_queue(name, 20, 200), setup=deck.clear_cache)
+    cards.card_queue(name, 20, 200)
+    record("card_queue", lambda: cards.card_queue(name, 20, 200))
+
+    queue = cards.card_queue(name, 20, 200)
+    record("card_status", lambda: cards.card_status(queue), ops=len(queue))
+
+    sample = [cards.Card.from_dict(c) for c in raw[:min(size, 10_000)]]
+    def schedule():
+        for i, card in enumerate(sample):
+            cards.update_schedule(card, i % 4)
+    record("update_schedule", schedule, ops=len(sample))
+
+    #simulasi sesi review: pop, rating, tulis lewat writer, lalu flush + checkpoint di akhir
+    def review_loop():
+        writer = WriteBehind("async")
+        session = cards.ReviewSession.for_deck(name, 20, 200)
+        index = cards.due_index(name)
+        done = 0
+        while session and done < ratings:
+            session.status()
+            card = session.pop()
+            session.reschedule(card, done % 4, index)
+            writer.save_card(name, card.to_dict())
+            writer.save_limit(name, 20, 200, [20, 200])
+            done += 1
+        writer.flush()
+        deck.checkpoint(name)
+    record("review_loop", review_loop, ops=ratings, setup=lambda: deck.save_deck(name, raw))
+
+    record("reset_due", lambda: cards.reset_due(name), ops=size)
+    deck.delete_deck(name)
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MemoRA pada deck sintetis")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="ukuran deck, dipisah koma")
+    parser.add_argument("--ratings", type=int, default=200, help="jumlah rating pada review_loop")
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran peak memori")
+    parser.add_argument("--out", help="file output JSON (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for size in sizes:
+        results.extend(bench_size(size, args.ratings, not args.no_memory))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": deck.STORAGE_BACKEND,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Simulasi review bertahun-tahun dengan jam manual (utils.clock), secepat CPU.
+
+Setiap hari simulasi: sesi dibuat dari card_queue sesuai limit, setiap kartu diberi rating acak
+(peluang --ratings), ditulis lewat WriteBehind, lalu flush + checkpoint di akhir hari.
+Hasilnya ukuran antrian per hari dan total waktu di tiap jalur utama.
+
+Contoh:
+    python -m benchmarks.simulate --cards 10000 --days 365 --out sim.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+#data simulasi tidak boleh menyentuh folder data pengguna
+if "MEMORA_DATA_DIR" not in os.environ:
+    os.environ["MEMORA_DATA_DIR"] = tempfile.mkdtemp(prefix="memora-sim-")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import utils.deck as deck
+import utils.cards as cards
+from utils import clock
+from utils.writer import WriteBehind
+from benchmarks.run import _git_commit
+from benchmarks.synthetic import synthetic_cards
+
+DAY = 86400
+#sesi dimulai jam 08:00 UTC, setiap jawaban memakan ANSWER_SECONDS detik simulasi
+SESSION_START = 8 * 3600
+ANSWER_SECONDS = 8
+
+class Timings:
+    """Akumulator waktu (detik) dan jumlah panggilan per jalur."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def run(self, name, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.seconds[name] += time.perf_counter() - start
+        self.calls[name] += 1
+        return result
+
+    def report(self):
+        return {name: {"seconds": round(self.seconds[name], 6), "calls": self.calls[name],
+                       "us_per_call": round(self.seconds[name] / self.calls[name] * 1e6, 3)}
+                for name in self.seconds}
+
+def simulate(name: str, days: int, new_limit: int, due_limit: int, ratings, seed: int,
+             durability: str, log: bool, start: int) -> dict:
+    rng = random.Random(seed)
+    sim_clock = clock.ManualClock(start)
+    timings = Timings()
+    daily = []
+    with clock.use_clock(sim_clock):
+        writer = WriteBehind(durability)
+        for day in range(days):
+            sim_clock.set(start + day * DAY + SESSION_START)
+            session = timings.run("card_queue", cards.ReviewSession.for_deck, name, new_limit, due_limit)
+            index = cards.due_index(name)
+            new, learning, due = session.status()
+            reviews = lapses = 0
+            while session:
+                card = session.pop()
+                quality = rng.choices(range(4), ratings)[0]
+                kind, prev_interval = cards._status_kind(card), card.interval
+                timings.run("update_schedule", session.reschedule, card, quality, index)
+                timings.run("save_card", writer.save_card, name, card.to_dict())
+                if log:
+                    timings.run("log_review", writer.log_review, name, card.id, kind, quality,
+                                prev_interval, card.interval, ANSWER_SECONDS * 1000)
+                reviews += 1
+                lapses += kind == 2 and quality == 0
+                sim_clock.advance(ANSWER_SECONDS)
+            timings.run("flush", writer.flush)
+            timings.run("checkpoint", deck.checkpoint, name)
+            daily.append({"day": day, "new": new, "learning": learning, "due": due,
+                          "reviews": reviews, "lapses": lapses})
+    return {"daily": daily, "timings": timings.report()}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulasi review MemoRA dengan jam manual")
+    parser.add_argument("--cards", type=int, default=10_000, help="jumlah kartu deck sintetis")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--new-limit", type=int, default=20)
+    parser.add_argument("--due-limit", type=int, default=200)
+    parser.add_argument("--ratings", default=",".join(str(p) for p in cards.FORECAST_RATINGS),
+                        help="peluang Again,Hard,Good,Easy")
+    parser.add_argument("--mature", action="store_true",
+                        help="mulai dari deck dengan jadwal campuran, bukan semua kartu baru")
+    parser.add_argument("--durability", default="batched", choices=("sync", "async", "batched"))
+    parser.add_argument("--log", action="store_true", help="tulis juga log rating (utils.reviewlog)")
+    parser.add_argument("--load-balance", action="store_true",
+                        help="sebar due kartu review ke hari tersepi (MEMORA_LOAD_BALANCE)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="file output JSON (default: stdout)")
+    args = parser.parse_args(argv)
+
+    ratings = [float(p) for p in args.ratings.split(",")]
+    if len(ratings) != 4:
+        parser.error("--ratings butuh 4 peluang")
+    cards.LOAD_BALANCE = args.load_balance or cards.LOAD_BALANCE
+    start = clock.now() // DAY * DAY
+    name = f"sim {args.cards}"
+    raw = synthetic_cards(args.cards, start, seed=args.seed,
+                          new_ratio=0.3 if args.mature else 1.0, learning_ratio=0.05 if args.mature else 0.0)
+    deck.create_deck(name)
+    deck.save_deck(name, raw)
+
+    wall = time.perf_counter()
+    result = simulate(name, args.days, args.new_limit, args.due_limit, ratings, args.seed,
+                      args.durability, args.log, start)
+    wall = time.perf_counter() - wall
+    reviews = sum(d["reviews"] for d in result["daily"])
+    report = {
+        "meta": {"commit": _git_commit(), "cards": args.cards, "days": args.days,
+                 "new_limit": args.new_limit, "due_limit": args.due_limit, "ratings": ratings,
+                 "durability": args.durability, "storage": deck.STORAGE_BACKEND, "seed": args.seed,
+                 "load_balance": cards.LOAD_BALANCE},
+        "summary": {"seconds": round(wall, 3), "reviews": reviews,
+                    "reviews_per_second": round(reviews / wall, 1) if wall > 0 else None,
+                    "peak_reviews": max((d["reviews"] for d in result["daily"]), default=0)},
+        **result,
+    }
+    deck.delete_deck(name)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import random
+import uuid
+from typing import Dict, List
+
+DAY = 86400
+
+#membuat deck sintetis dengan distribusi jadwal yang mirip pemakaian nyata:
+#sebagian kartu baru, sedikit kartu learning, sisanya kartu review dengan interval bervariasi
+def synthetic_cards(size: int, now: int, seed: int = 0,
+                    new_ratio: float = 0.3, learning_ratio: float = 0.05) -> List[Dict]:
+    rng = random.Random(seed)
+    cards = []
+    for i in range(size):
+        r = rng.random()
+        card = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "front": f"Pertanyaan {i}",
+            "back": f"Jawaban {i}",
+            "interval": 1,
+            "ease_factor": 2.5,
+            "step": 1,
+            "due": now,
+            "first_time": True,
+        }
+        if r < new_ratio:
+            pass
+        elif r < new_ratio + learning_ratio:
+            card.update(step=rng.randint(1, 3), first_time=False,
+                        due=now + rng.choice((60, 360, 600)))
+        else:
+            #interval log-normal (median ~12 hari), due tersebar dari terlambat sampai satu interval ke depan
+            interval = max(1, round(rng.lognormvariate(2.5, 1.0)))
+            ease = round(min(3.5, max(1.3, rng.gauss(2.5, 0.25))), 2)
+            due = now + int(rng.uniform(-0.2, 1.0) * interval * DAY)
+            card.update(step=4, first_time=False, interval=interval, ease_factor=ease, due=due)
+        cards.append(card)
+    return cards
@@ -1,10 +1,11 @@
 import os
-import ctypes
-import msvcrt
-import shutil
-import time
+import layout
 import sys
-from utils.deck import load_index
+import contextlib
+import atexit
+import selectors
+import signal
+import threading
 
 """Material & Needs"""
 #Import Warna
@@ -18,81 +19,486 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
+STD_INPUT_HANDLE = -10
 STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+
+#escape sequence: hapus layar lalu kursor ke pojok kiri atas
+CLEAR_SEQ = "\x1b[2J\x1b[H"
+
+#tombol biasa (sudah didecode) menjadi token yang sama di semua backend
+def _key_token(ch):
+    if ch in ('\r', '\n'):
+        return 'ENTER'
+    if ch == '\x1b':
+        return 'ESC'
+    if ch == '\t':
+        return 'TAB'
+    if ch == ' ':
+        return 'SPASI'
+    if ch in ('q', 'Q'):
+        return 'q'
+    return ('CHAR', ch)
+
+#atribut warna gaya windows (bit biru/hijau/merah/terang) menjadi kode warna ANSI
+def _ansi_color(color):
+    if color == WHITE:
+        return "\x1b[0m"
+    fg = color & 0x07
+    code = ((fg & RED) >> 2) | (fg & GREEN) | ((fg & BLUE) << 2)
+    seq = f"\x1b[0;{(90 if color & BRIGHT else 30) + code}"
+    bg = (color >> 4) & 0x0F
+    if bg:
+        bcode = ((bg & RED) >> 2) | (bg & GREEN) | ((bg & BLUE) << 2)
+        seq += f";{(100 if bg & BRIGHT else 40) + bcode}"
+    return seq + "m"
+
+class WindowsConsole:
+    """Backend console windows (msvcrt + SetConsoleTextAttribute)."""
+
+    #resize jendela tidak selalu menghasilkan event console, jadi penantian dibatasi (ms)
+    RESIZE_CHECK_MS = 250
+    resize_events = False
+
+    def __init__(self):
+        import ctypes
+        import msvcrt
+        self._msvcrt = msvcrt
+        self._kernel32 = ctypes.windll.kernel32
+        self._handle = self._kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+        self._input = self._kernel32.GetStdHandle(STD_INPUT_HANDLE)
+        self.ansi = self._enable_vt(ctypes)
+
+    #windows 10+ bisa memproses escape sequence; kalau gagal, clear tetap pakai cls
+    def _enable_vt(self, ctypes):
+        mode = ctypes.c_uint32()
+        if not self._kernel32.GetConsoleMode(self._handle, ctypes.byref(mode)):
+            return False
+        return bool(self._kernel32.SetConsoleMode(self._handle, mode.value | 0x0004))
+
+    def clear(self):
+        if self.ansi:
+            sys.stdout.write(CLEAR_SEQ)
+            sys.stdout.flush()
+        else:
+            os.system('cls')
+
+    def set_color(self, color):
+        #teks yang masih di buffer harus keluar dengan warna sebelumnya
+        sys.stdout.flush()
+        self._kernel32.SetConsoleTextAttribute(self._handle, color)
+
+    def raw(self):
+        return contextlib.nullcontext()
+
+    def cooked(self):
+        return contextlib.nullcontext()
+
+    def kbhit(self):
+        return self._msvcrt.kbhit()
+
+    #tidur sampai ada input console; 'KEY' kalau ada tombol, None kalau waktu habis / event lain
+    def wait_event(self, timeout=None):
+        wait_ms = self.RESIZE_CHECK_MS if timeout is None else int(timeout * 1000)
+        if self._kernel32.WaitForSingleObject(self._input, wait_ms) != 0:
+            return None
+        if self._msvcrt.kbhit():
+            return 'KEY'
+        #event selain tombol (mouse, fokus, key-up) dibuang agar handle tidak terus tersinyal
+        self._kernel32.FlushConsoleInputBuffer(self._input)
+        return None
+
+    def read_key(self):
+        k = self._msvcrt.getch()
+        if k in (b'\x00', b'\xe0'):
+            k2 = self._msvcrt.getch()
+            return {b'H': 'UP', b'P': 'DOWN', b'K': 'LEFT', b'M': 'RIGHT'}.get(k2, 'OTHER')
+        return _key_token(k.decode('utf-8', errors='ignore'))
+
+    #satu karakter untuk input baris: Enter = '\r', Backspace = '\x08'
+    def read_char(self):
+        return self._msvcrt.getwch()
+
+    def flush_input(self):
+        while self._msvcrt.kbhit():
+            try:
+                self._msvcrt.getch()
+            except OSError:
+                break
+
+#escape sequence tombol panah dari terminal POSIX
+_ANSI_KEYS = {"[A": 'UP', "[B": 'DOWN', "[C": 'RIGHT', "[D": 'LEFT',
+              "OA": 'UP', "OB": 'DOWN', "OC": 'RIGHT', "OD": 'LEFT'}
+
+class PosixConsole:
+    """Backend console POSIX (termios cbreak + warna ANSI)."""
+
+    #jeda maksimal antar byte dalam satu escape sequence
+    ESC_TIMEOUT = 0.03
+    ansi = True
+    #SIGWINCH memberi tahu resize, jadi ukuran terminal boleh di-cache
+    resize_events = True
+
+    def __init__(self):
+        import termios
+        import tty
+        import select
+        self._termios = termios
+        self._tty = tty
+        self._select = select
+        self._fd = sys.stdin.fileno()
+        self._saved = None
+        self._selector = None
+        #handler resize dipasang sejak awal agar cache ukuran tidak basi sebelum penantian pertama
+        self._wakeup, wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup, False)
+        os.set_blocking(wakeup_w, False)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGWINCH, lambda *_: self._on_resize(wakeup_w))
+
+    def clear(self):
+        sys.stdout.write(CLEAR_SEQ)
+        sys.stdout.flush()
+
+    def set_color(self, color):
+        sys.stdout.write(_ansi_color(color))
+
+    #mode cbreak dipasang sekali lalu dipertahankan; kalau dilepas di antara tombol,
+    #ketikan cepat yang belum terbaca bisa hilang saat terminal kembali ke mode kanonik
+    @contextlib.contextmanager
+    def raw(self):
+        if self._saved is None and os.isatty(self._fd):
+            self._saved = self._termios.tcgetattr(self._fd)
+            self._tty.setcbreak(self._fd)
+            atexit.register(self.restore)
+        yield
+
+    #mode normal sementara untuk input() biasa (echo + edit baris)
+    @contextlib.contextmanager
+    def cooked(self):
+        if self._saved is None:
+            yield
+            return
+        self._termios.tcsetattr(self._fd, self._termios.TCSADRAIN, self._saved)
+        try:
+            yield
+        finally:
+            self._tty.setcbreak(self._fd)
+
+    def restore(self):
+        if self._saved is not None:
+            self._termios.tcsetattr(self._fd, self._termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def _ready(self, timeout):
+        return bool(self._select.select([self._fd], [], [], timeout)[0])
+
+    #baca satu karakter utf-8 utuh langsung dari fd (tanpa buffer sys.stdin)
+    #stdin tertutup (EOF) -> EOFError seperti input(); jangan dianggap ESC agar loop pemanggil tidak berputar
+    def _getc(self):
+        first = os.read(self._fd, 1)
+        if not first:
+            raise EOFError
+        lead = first[0]
+        extra = 3 if lead >= 0xF0 else 2 if lead >= 0xE0 else 1 if lead >= 0xC0 else 0
+        data = first
+        for _ in range(extra):
+            data += os.read(self._fd, 1)
+        return data.decode('utf-8', errors='ignore')
+
+    def kbhit(self):
+        with self.raw():
+            return self._ready(0)
+
+    #stdin dan self-pipe SIGWINCH didaftarkan ke selector saat pertama kali menunggu
+    def _events(self):
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ, 'KEY')
+            self._selector.register(self._wakeup, selectors.EVENT_READ, 'RESIZE')
+        return self._selector
+
+    @staticmethod
+    def _on_resize(w):
+        layout.invalidate()
+        try:
+            os.write(w, b"\0")
+        except BlockingIOError:
+            pass
+
+    #tidur sampai tombol ditekan atau terminal di-resize: 'KEY', 'RESIZE', atau None (timeout)
+    def wait_event(self, timeout=None):
+        with self.raw():
+            ready = {key.data for key, _ in self._events().select(timeout)}
+        if 'RESIZE' in ready:
+            try:
+                while os.read(self._wakeup, 64):
+                    pass
+            except BlockingIOError:
+                pass
+            return 'RESIZE'
+        return 'KEY' if 'KEY' in ready else None
+
+    def read_key(self):
+        sys.stdout.flush()
+        with self.raw():
+            ch = self._getc()
+            if ch != '\x1b':
+                return _key_token(ch)
+            seq = ""
+            while self._ready(self.ESC_TIMEOUT):
+                seq += self._getc()
+                if len(seq) > 1 and (seq[-1].isalpha() or seq[-1] == '~'):
+                    break
+            if not seq:
+                return 'ESC'
+            return _ANSI_KEYS.get(seq, 'OTHER')
+
+    def read_char(self):
+        sys.stdout.flush()
+        with self.raw():
+            ch = self._getc()
+        if ch == '\n':
+            return '\r'
+        if ch == '\x7f':
+            return '\x08'
+        return ch
+
+    def flush_input(self):
+        if os.isatty(self._fd):
+            self._termios.tcflush(self._fd, self._termios.TCIFLUSH)
+
+#backend dipilih sekali sesuai OS
+backend = WindowsConsole() if os.name == 'nt' else PosixConsole()
+
+class FrameBuffer:
+    """Satu frame layar sebagai baris sel (karakter, warna)."""
+
+    def __init__(self):
+        self.lines = [[]]
+        self.row = 0
+        self.col = 0
+        self.color = WHITE
+
+    def write(self, text):
+        for ch in text:
+            if ch == '\n':
+                self.row += 1
+                self.col = 0
+                if self.row == len(self.lines):
+                    self.lines.append([])
+            elif ch == '\r':
+                self.col = 0
+            elif ch == '\b':
+                self.col = max(0, self.col - 1)
+            elif ch == '\t':
+                self.write(" " * (8 - self.col % 8))
+            else:
+                width = layout.char_width(ch)
+                line = self.lines[self.row]
+                if width == 0:
+                    #combining digabung ke sel sebelumnya
+                    if 0 < self.col <= len(line):
+                        prev, color = line[self.col - 1]
+                        line[self.col - 1] = (prev + ch, color)
+                    continue
+                self._put(line, (ch, self.color))
+                if width == 2:
+                    #sel kedua karakter lebar kosong agar indeks sel = kolom layar
+                    self._put(line, ("", self.color))
+        return len(text)
+
+    def _put(self, line, cell):
+        if self.col < len(line):
+            line[self.col] = cell
+        else:
+            line.extend([(" ", WHITE)] * (self.col - len(line)))
+            line.append(cell)
+        self.col += 1
+
+class Renderer:
+    """Menangkap print selama menggambar, lalu menulis hanya bagian yang berubah dalam satu write.
+
+    Frame dimulai oleh clear() dan ditampilkan oleh present() (dipanggil otomatis sebelum
+    menunggu input). Tulisan di luar frame langsung ke terminal dan membuat redraw berikutnya penuh.
+    """
+
+    def __init__(self, out):
+        self.out = out
+        self.frame = None
+        self._prev = None
+        self._prev_size = None
+        self._color = None
+
+    def begin(self):
+        self.frame = FrameBuffer()
+
+    def invalidate(self):
+        self._prev = None
+
+    def write(self, text):
+        if self.frame is not None:
+            return self.frame.write(text)
+        if text:
+            self._prev = None
+        return self.out.write(text)
+
+    def present(self):
+        frame = self.frame
+        if frame is None:
+            self.out.flush()
+            return
+        self.frame = None
+        size = layout.terminal_size()
+        cols, rows = size
+        lines = frame.lines
+        #newline terakhir tidak perlu menggulung layar
+        while len(lines) > rows and not lines[-1]:
+            lines.pop()
+        if len(lines) > rows:
+            #frame lebih tinggi dari terminal: ditulis berurutan dan terminal menggulung seperti biasa
+            parts = [CLEAR_SEQ]
+            color = None
+            for i, line in enumerate(lines):
+                if i:
+                    parts.append("\n")
+                color = self._emit(parts, line, color)
+            parts.append(_ansi_color(frame.color))
+            self.out.write("".join(parts))
+            self.out.flush()
+            self._prev = None
+            return
+        prev = self._prev if size == self._prev_size else None
+        parts = []
+        color = self._color
+        if prev is None:
+            parts.append(CLEAR_SEQ)
+            prev = []
+            color = None
+        for i in range(max(len(lines), len(prev))):
+            new = lines[i] if i < len(lines) else []
+            old = prev[i] if i < len(prev) else []
+            if new == old:
+                continue
+            start = 0
+            common = min(len(new), len(old))
+            while start < common and new[start] == old[start]:
+                start += 1
+            #jangan mulai di tengah karakter lebar
+            if start and start < len(new) and new[start][0] == "":
+                start -= 1
+            end = len(new)
+            if len(new) == len(old):
+                while end > start and new[end - 1] == old[end - 1]:
+                    end -= 1
+            parts.append(f"\x1b[{i + 1};{start + 1}H")
+            color = self._emit(parts, new[start:end], color)
+            if len(old) > len(new):
+                parts.append(_ansi_color(WHITE) + "\x1b[K")
+                color = WHITE
+        if color != frame.color:
+            parts.append(_ansi_color(frame.color))
+            color = frame.color
+        if parts:
+            parts.append(f"\x1b[{min(frame.row, rows - 1) + 1};{frame.col + 1}H")
+            self.out.write("".join(parts))
+            self.out.flush()
+        self._prev = lines
+        self._prev_size = size
+        self._color = color
+
+    @staticmethod
+    def _emit(parts, cells, color):
+        for ch, c in cells:
+            if c != color:
+                parts.append(_ansi_color(c))
+                color = c
+            parts.append(ch)
+        return color
+
+class _ScreenStream:
+    """Pengganti sys.stdout: print diarahkan ke renderer, atribut lain diteruskan ke stdout asli."""
+
+    def __init__(self, renderer):
+        self._renderer = renderer
+
+    def write(self, text):
+        return self._renderer.write(text)
+
+    def flush(self):
+        #selama menggambar flush ditunda sampai present()
+        if self._renderer.frame is None:
+            self._renderer.out.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._renderer.out, name)
+
+#renderer hanya dipakai kalau output ke terminal yang mengerti ANSI
+renderer = None
+if backend.ansi and sys.stdout is not None and sys.stdout.isatty():
+    renderer = Renderer(sys.stdout)
+    sys.stdout = _ScreenStream(renderer)
+    atexit.register(renderer.present)
+
+#tampilkan frame yang sedang digambar (sebelum menunggu input atau membuka dialog)
+def present():
+    if renderer is not None:
+        renderer.present()
+    else:
+        sys.stdout.flush()
 
 """Fungsi Penting"""
-#Clear Tampilan
+#Clear Tampilan (memulai frame baru; layar lama tidak dihapus dulu, hanya ditimpa bagian yang berubah)
 def clear():
-    os.system('cls')
+    if renderer is not None:
+        renderer.begin()
+    else:
+        backend.clear()
 
 #Ganti Warna
 def set_color(color):
-    ctypes.windll.kernel32.SetConsoleTextAttribute(h, color)
+    if renderer is not None and renderer.frame is not None:
+        renderer.frame.color = color
+    else:
+        backend.set_color(color)
 
 #Align Center
 def center_text(text):
-    cols, _ = shutil.get_terminal_size()
-    x = (cols - len(text)) // 2
-    return " " * x + text
+    cols, _ = layout.terminal_size()
+    return layout.center(text, cols)
 
 # baca input keyboard menjadi token terpusat (UP/DOWN/LEFT/RIGHT/ENTER/ESC/TAB/'CHAR')
 def read_key():
-    k = msvcrt.getch()
-    if k in (b'\x00', b'\xe0'):
-        k2 = msvcrt.getch()
-        if k2 == b'H':
-            return 'UP'
-        if k2 == b'P':
-            return 'DOWN'
-        if k2 == b'K':
-            return 'LEFT'
-        if k2 == b'M':
-            return 'RIGHT'
-        return 'OTHER'
-    if k == b'\r':
-        return 'ENTER'
-    if k == b'\x1b':
-        return 'ESC'
-    if k == b'\t':
-        return 'TAB'
-    if k == b' ':
-        return 'SPASI'
-    if k == b'q' or k == b"Q":
-        return 'q'
-    try:
-        return ('CHAR', k.decode('utf-8', errors='ignore'))
-    except Exception:
-        return ('CHAR', '')
+    present()
+    return backend.read_key()
 
 # Tunggu hanya tombol Enter (isolasi input)
 def wait_for_enter(prompt=None):
     if prompt:
         print(prompt)
+    present()
     # buang semua input yang tertinggal
-    while msvcrt.kbhit():
-        try:
-            msvcrt.getch()
-        except OSError:
-            break
-    # tunggu hingga Enter (CR) ditekan
-    while True:
-        key = msvcrt.getch()
-        if key == b'\r':  # Enter
-            break
-        # jika key adalah prefix untuk key spesial, buang byte berikutnya
-        if key in (b'\x00', b'\xe0'):
-            try:
-                msvcrt.getch()
-            except OSError:
-                pass
-            continue
-        # selain itu, abaikan dan terus tunggu
+    backend.flush_input()
+    # tunggu hingga Enter ditekan, tombol lain diabaikan
+    while backend.read_key() != 'ENTER':
+        pass
+
+#input() biasa; di POSIX terminal dikembalikan ke mode normal selama mengetik
+def read_line(prompt=""):
+    present()
+    with backend.cooked():
+        line = input(prompt)
+    #prompt dan ketikan ada di layar tanpa lewat renderer
+    if renderer is not None:
+        renderer.invalidate()
+    return line
 
 #fungsi cek ukuran terminal
 def get_terminal_size():
-    cols, rows = shutil.get_terminal_size()
-    return cols, rows
+    return layout.terminal_size()
+
+#ukuran terbaru; tanpa sinyal resize (windows) cache dibaca ulang tiap kali dicek
+def _current_size():
+    return layout.terminal_size() if backend.resize_events else layout.refresh()
 
 min_cols = 85
 min_rows = 20
@@ -100,7 +506,7 @@ min_rows = 20
 def monitor_terminal_size():
     """Loop cek ukuran terminal. Return saat ukuran OK atau ESC ditekan."""
     while True:
-        cols, rows = shutil.get_terminal_size()
+        cols, rows = _current_size()
         if cols >= min_cols and rows >= min_rows:
             return True
         
@@ -111,8 +517,10 @@ def monitor_terminal_size():
         print(center_text("Beberapa tampilan mungkin terpotong."))
         print(center_text("Perbesar terminal atau tekan ESC untuk keluar."))
         set_color(WHITE)
+        present()
         
-        if msvcrt.kbhit():
+        #layar digambar ulang hanya saat ada tombol atau resize
+        if backend.wait_event() == 'KEY':
             k = read_key()
             if k == 'ESC':
                 clear()
@@ -120,17 +528,16 @@ def monitor_terminal_size():
                 print(center_text("Terima Kasih telah menggunakan MemoRA!"))
                 set_color(WHITE)
                 return False
-        
-        time.sleep(0.5)
 
 EXIT_TOKEN = "__EXIT__"
 
 def wait_for_key_with_resize(prev_size):
+    present()
     while True:
-        if msvcrt.kbhit():
+        if backend.kbhit():
             return read_key(), prev_size
 
-        cols_now, rows_now = get_terminal_size()
+        cols_now, rows_now = _current_size()
         if cols_now < min_cols or rows_now < min_rows:
             if not monitor_terminal_size():
                 return EXIT_TOKEN, prev_size
@@ -141,7 +548,7 @@ def wait_for_key_with_resize(prev_size):
         if (cols_now, rows_now) != prev_size:
             return None, (cols_now, rows_now)
 
-        time.sleep(0.1)
+        backend.wait_event()
 
 def print_spacer_before_bottom_options(lines_used, bottom_section_height):
     _, rows = get_terminal_size()
@@ -152,11 +559,12 @@ def print_spacer_before_bottom_options(lines_used, bottom_section_height):
 
 def input_with_esc(prompt=""):
         
+    present()
     sys.stdout.write(prompt)
     sys.stdout.flush()
     buf = ""
     while True:
-        ch = msvcrt.getwch()  # baca karakter sebagai str
+        ch = backend.read_char()  # baca karakter sebagai str
         if ch == '\r':  # Enter
             sys.stdout.write("\n")
             return buf, False
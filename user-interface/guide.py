@@ -1,5 +1,3 @@
-import ctypes
-
 from console import (
     set_color,
     center_text,
@@ -17,9 +15,6 @@ YELLOW = RED | GREEN
 CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
-
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
     
 """Panduan Penggunaan"""
 def panduan_penggunaan():
@@ -1,17 +1,17 @@
-from nt import get_terminal_size
 import os
-import ctypes
 import json
 import shutil
-from utils.deck import DATA_DIR, _ensure_index, load_index, save_index
+import utils.deck as deck
+from utils.deck import DATA_DIR, _ensure_index, load_index, save_index, migrate_to_sqlite, discard_journal
 from pathlib import Path
 from utils.cards import reset_due
-from tkinter import Tk, filedialog
 
 from console import (
     set_color,
     center_text,
     wait_for_enter,
+    read_line,
+    present,
     )
 
 EXIT_TOKEN = "__EXIT__"
@@ -28,9 +28,6 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-
 """Import Deck Baru"""
 def import_deck():
     while True:
@@ -39,6 +36,9 @@ def import_deck():
 
         # buka file explorer untuk memilih file .json
         def select_json_file():
+            #tkinter dimuat hanya saat dialog dibutuhkan
+            from tkinter import Tk, filedialog
+            present()
             root = Tk()
             root.withdraw()              # sembunyikan jendela utama
             root.attributes('-topmost', True)
@@ -79,21 +79,23 @@ def import_deck():
             
             # ambil nama deck dari nama file
             name = os.path.splitext(os.path.basename(file_path))[0]
+            #nama deck seperti tersimpan di decks_index.json (dipakai sebagai key meta, journal, dan log)
+            deck_name = name.replace("_"," ")
             
             # cek apakah nama deck sudah ada
             index = load_index()
             decks = index.setdefault("decks", [])
             
-            if name in decks:
+            if deck_name in decks:
                 # tampilkan peringatan jika deck sudah ada
                 set_color(BRIGHT | YELLOW)
                 print()
-                print(center_text(f"Peringatan: Deck dengan nama '{name}' sudah ada!"))
+                print(center_text(f"Peringatan: Deck dengan nama '{deck_name}' sudah ada!"))
                 set_color(WHITE)
                 print()
                 print(center_text("Apakah Anda ingin mengganti deck yang sudah ada?"))
                 print()
-                overwrite = input(center_text("Lanjutkan? (y/n): ")).strip().lower()
+                overwrite = read_line(center_text("Lanjutkan? (y/n): ")).strip().lower()
                 
                 if overwrite != 'y':
                     set_color(RED)
@@ -107,9 +109,13 @@ def import_deck():
             
             # copy file dan update index
             shutil.copy(file_path, DATA_DIR)
-            if name not in decks:
-                decks.append(name.replace("_"," "))
+            discard_journal(deck_name)
+            if deck_name not in decks:
+                decks.append(deck_name)
                 save_index(index)
+            #backend sqlite: isi file json dipindah ke database
+            if deck.STORAGE_BACKEND == "sqlite":
+                migrate_to_sqlite([deck_name])
         except Exception as e:
             set_color(RED)
             print()
@@ -129,5 +135,5 @@ def import_deck():
         print()
         wait_for_enter(center_text("Tekan Enter untuk kembali ke menu..."))
         set_color(WHITE)
-        reset_due(name)
+        reset_due(deck_name)
         return data
@@ -0,0 +1,96 @@
+import shutil
+import unicodedata
+from functools import lru_cache
+
+#ukuran terminal terakhir; dibaca ulang hanya setelah resize (invalidate)
+_size = None
+
+#ukuran terminal (cols, rows) dari cache
+def terminal_size():
+    global _size
+    if _size is None:
+        _size = tuple(shutil.get_terminal_size())
+    return _size
+
+#dipanggil saat terminal di-resize (SIGWINCH atau perubahan ukuran terdeteksi)
+def invalidate():
+    global _size
+    _size = None
+
+#baca ulang ukuran sekarang (untuk platform tanpa sinyal resize)
+def refresh():
+    invalidate()
+    return terminal_size()
+
+#jumlah spasi agar teks sepanjang length berada di tengah
+@lru_cache(maxsize=256)
+def offset(length, width):
+    return max(0, (width - length) // 2)
+
+#lebar tampilan satu karakter: CJK/emoji 2 kolom, combining & kontrol 0 kolom
+@lru_cache(maxsize=4096)
+def char_width(ch):
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ("Cc", "Cf", "Mn", "Me"):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+#lebar tampilan teks di terminal (bukan len)
+def text_width(text):
+    if text.isascii():
+        return len(text)
+    return sum(char_width(ch) for ch in text)
+
+#teks rata tengah untuk lebar tertentu
+@lru_cache(maxsize=1024)
+def center(text, width):
+    return " " * offset(text_width(text), width) + text
+
+#kata per paragraf beserta lebarnya; tidak bergantung lebar terminal jadi resize tidak memecah ulang teks
+@lru_cache(maxsize=1024)
+def _tokens(text):
+    return tuple(tuple((word, text_width(word)) for word in para.split(" "))
+                 for para in text.split("\n"))
+
+#potong teks menjadi baris selebar width kolom; kata yang terlalu panjang dipotong per karakter
+@lru_cache(maxsize=1024)
+def wrap(text, width):
+    width = max(1, width)
+    lines = []
+    for para in _tokens(text):
+        line, used = [], 0
+        for word, w in para:
+            if w > width:
+                if line:
+                    lines.append(" ".join(line))
+                chunk, used = "", 0
+                for ch in word:
+                    cw = char_width(ch)
+                    if used + cw > width:
+                        lines.append(chunk)
+                        chunk, used = "", 0
+                    chunk += ch
+                    used += cw
+                line = [chunk]
+                continue
+            need = used + 1 + w if line else w
+            if line and need > width:
+                lines.append(" ".join(line))
+                line, used = [word], w
+            else:
+                line.append(word)
+                used = need
+        lines.append(" ".join(line))
+    return tuple(lines)
+
+#baris depan & belakang kartu untuk lebar tertentu; dicache per (id kartu, lebar)
+#sehingga bolak-balik pertanyaan/jawaban tidak memotong ulang teks
+@lru_cache(maxsize=512)
+def _card_lines(card_id, width, front, back):
+    return wrap(front, width), wrap(back, width)
+
+def wrap_card(card, width):
+    return _card_lines(card.id, width, card.front, card.back)
+
+#lebar area teks kartu: sedikit lebih sempit dari terminal
+def text_area(cols):
+    return max(20, cols - 10)
@@ -1,15 +1,12 @@
 import os
-import ctypes
-import msvcrt
 import shutil
 import json
 import time
-import webbrowser
-from tkinter import Tk, filedialog
 
-from datetime import datetime, timezone
-from utils.deck import delete_deck, rename_deck, load_index, load_deck, save_deck
+from utils.deck import delete_deck, rename_deck, load_index, load_deck, save_deck, save_card, open_deck
 from utils.cards import Card, add_card, reset_due, human_date
+import utils.stats as stats
+from utils import clock
 from console import (
     clear,
     read_key,
@@ -17,6 +14,8 @@ from console import (
     center_text,
     wait_for_enter,
     input_with_esc,
+    read_line,
+    present,
     get_terminal_size,
     monitor_terminal_size,
     wait_for_key_with_resize,
@@ -35,9 +34,6 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-
 options = [
                 "Ringkasan",
                 "Edit Kartu",
@@ -56,25 +52,16 @@ def deck_summary(deck_name):
     set_color(BRIGHT | CYAN)
     print(center_text(f"=== Ringkasan Deck: {deck_name} ==="))
     set_color(WHITE)
-    deck = load_deck(deck_name)
+    #semua metrik dari satu statistik yang sudah dihitung (diperbarui per rating)
+    summary = stats.deck_summary(deck_name)
     print()
-    print("     " + f"Total Kartu        : {len(deck)}")
-    print("     " + f"Kartu baru         : {len([Card.from_dict(c) for c in deck if c.get("first_time") == True ])}")
-    print("     " + f"kartu jatuh tempo  : {len([Card.from_dict(c) for c in deck if c.get("first_time") == False 
-                                                 and datetime.fromisoformat(c.get("due")) <= datetime.now(timezone.utc)])}")
-    if min([Card.from_dict(c).due for c in deck], default=None) == None:
-        closest_date = None
-    else:
-        closest_date = human_date(min([Card.from_dict(c).due for c in deck], default=None))
+    print("     " + f"Total Kartu        : {summary['total']}")
+    print("     " + f"Kartu baru         : {summary['new']}")
+    print("     " + f"kartu jatuh tempo  : {summary['due']}")
+    closest_date = None if summary["next_due"] is None else human_date(summary["next_due"])
     print("     " + f"Jadwal Terdekat    : {closest_date}")
-    if max([Card.from_dict(c).interval for c in deck], default=None ) == None:
-        avg_interval = None
-        max_inteval = None
-    else: 
-        avg_interval = sum([Card.from_dict(c).interval for c in deck]) / len([Card.from_dict(c) for c in deck])
-        max_inteval = max([Card.from_dict(c).interval for c in deck])
-    print("     " + f"Interval Rata Rata : {avg_interval}")
-    print("     " + f"Interval Terbesar  : {max_inteval}")
+    print("     " + f"Interval Rata Rata : {summary['avg_interval']}")
+    print("     " + f"Interval Terbesar  : {summary['max_interval']}")
     print()
     set_color(BRIGHT | YELLOW)
     wait_for_enter(center_text("Tekan Enter untuk kembali..."))
@@ -138,7 +125,7 @@ def card_list(deck_name):
 
 #cek informasi kartu
 def card_info(deck_name):
-    cards_raw = load_deck(deck_name)
+    deck = open_deck(deck_name)
     set_color(BRIGHT | CYAN)
     print(center_text(f"=== Informasi Kartu di: {deck_name} ==="))
     set_color(WHITE)
@@ -150,10 +137,8 @@ def card_info(deck_name):
     card_id, canceled = input_with_esc("Masukkan ID Kartu: ")
     if canceled:
         return
-    for c in cards_raw:
-        if c.get("id") == card_id:
-            card = c
-    if card_id not in (c.get("id") for c in cards_raw):
+    card = deck.get(card_id)
+    if card is None:
         set_color(RED)
         print()
         print(center_text("ID Kartu tidak valid!"))
@@ -176,7 +161,7 @@ def card_info(deck_name):
 #edit kartu
 def card_edit(deck_name):
     prev_size = get_terminal_size()
-    cards = [Card.from_dict(c) for c in load_deck(deck_name)]
+    deck = open_deck(deck_name)
     set_color(BRIGHT | CYAN)
     print(center_text(f"=== Edit Kartu di: {deck_name} ==="))
     set_color(WHITE)
@@ -188,10 +173,7 @@ def card_edit(deck_name):
     card_id, canceled = input_with_esc("Masukkan ID Kartu yang akan diedit: ")
     if canceled:
         return
-    for c in cards:
-        if c.id == card_id:
-            card = c
-    if card_id not in (c.id for c in cards):
+    if card_id not in deck:
         set_color(RED)
         print()
         print(center_text("ID Kartu tidak valid!"))
@@ -209,10 +191,7 @@ def card_edit(deck_name):
     ]
 
     while True:
-        cards = [Card.from_dict(c) for c in load_deck(deck_name)]
-        for c in cards:
-            if c.id == card_id:
-                card = c
+        card = Card.from_dict(deck.get(card_id))
         clear()
         set_color(BRIGHT | CYAN)
         print(center_text(f"=== Edit Kartu di: {deck_name} ==="))
@@ -266,8 +245,8 @@ def card_edit(deck_name):
                     print(center_text("Pertanyaan tidak boleh kosong!"))
                 if new_front.strip():    
                     card.front = new_front
-                    cards = [Card.to_dict(c)for c in cards]
-                    save_deck(deck_name, cards)
+                    deck.update(card.to_dict())
+                    save_card(deck_name, card.to_dict())
                     print(f"     Pertanyaan telah diubah menjadi : {new_front}")
                 set_color(BRIGHT | YELLOW)
                 wait_for_enter(center_text("Tekan Enter untuk kembali..."))
@@ -292,8 +271,8 @@ def card_edit(deck_name):
                     print(center_text("Jawaban tidak boleh kosong!"))
                 if new_back.strip():
                     card.back = new_back
-                    cards = [Card.to_dict(c)for c in cards]
-                    save_deck(deck_name, cards)
+                    deck.update(card.to_dict())
+                    save_card(deck_name, card.to_dict())
                     print(f"     Pertanyaan telah diubah menjadi : {new_back}")
                 set_color(BRIGHT | YELLOW)
                 wait_for_enter(center_text("Tekan Enter untuk kembali..."))
@@ -303,15 +282,15 @@ def card_edit(deck_name):
                 print(center_text(f"=== Edit Kartu di: {deck_name} ==="))
                 set_color(WHITE)
                 print()
-                confirm = input("     Yakin reset waktu kartu ini? (y/n): ")
+                confirm = read_line("     Yakin reset waktu kartu ini? (y/n): ")
                 if confirm.lower() == 'y':
-                    card.due = datetime.now(timezone.utc).isoformat()
+                    card.due = clock.now()
                     card.first_time = True
                     card.interval = 1
                     card.step = 1
                     card.ease_factor = 2.5
-                    cards = [Card.to_dict(c)for c in cards]
-                    save_deck(deck_name, cards)
+                    deck.update(card.to_dict())
+                    save_card(deck_name, card.to_dict())
                     print(center_text("Waktu telah direset")) 
                 else:
                     print()
@@ -328,11 +307,10 @@ def card_edit(deck_name):
                 print(center_text(f"=== Edit Kartu di: {deck_name} ==="))
                 set_color(WHITE)
                 print()
-                confirm = input("     Yakin hapus kartu ini? (y/n): ")
+                confirm = read_line("     Yakin hapus kartu ini? (y/n): ")
                 if confirm.lower() == 'y':
-                    cards.remove(card)
-                    cards = [Card.to_dict(c)for c in cards]
-                    save_deck(deck_name, cards)
+                    deck.delete(card_id)
+                    deck.save()
                     print()
                     set_color(RED)
                     print(center_text("Kartu telah dihapus."))
@@ -356,7 +334,7 @@ def reset_times(deck_name):
     print(center_text(f"=== Reset Waktu Kartu di: {deck_name} ==="))
     set_color(WHITE)
     print()
-    confirm = input("Apakah Anda yakin ingin mereset waktu semua kartu? (y/n): ")
+    confirm = read_line("Apakah Anda yakin ingin mereset waktu semua kartu? (y/n): ")
     if confirm.lower() == 'y':
         reset_due(deck_name)
         print()
@@ -421,6 +399,9 @@ def export_deck(deck_name):
     
     # buka file explorer untuk memilih lokasi penyimpanan
     def select_save_path(default_name):
+        #tkinter dimuat hanya saat dialog dibutuhkan
+        from tkinter import Tk, filedialog
+        present()
         root = Tk()
         root.withdraw()  # sembunyikan jendela utama
         root.attributes('-topmost', True)
@@ -489,7 +470,7 @@ def remove_deck(deck_name):
         print(center_text(f"=== Hapus Deck: {deck_name} ==="))
         set_color(WHITE)
         print()
-        confirm = input("Apakah Anda yakin ingin menghapus deck ini? (y/n): ")
+        confirm = read_line("Apakah Anda yakin ingin menghapus deck ini? (y/n): ")
         if confirm.lower() == 'y':
             print()
             delete_deck(deck_name)
@@ -565,8 +546,9 @@ def manage_deck(avail_decks):
             clear()
             print()
             set_color(RED)
-            confirm = input(center_text("Apakah kamu ingin membuka kumpulan deck online (y/n): "))
+            confirm = read_line(center_text("Apakah kamu ingin membuka kumpulan deck online (y/n): "))
             if confirm == 'y':
+                import webbrowser
                 url = "https://github.com/Stonelynx156/MemoRA_shared-deck"
                 webbrowser.open(url)
                 set_color(WHITE)
@@ -575,8 +557,9 @@ def manage_deck(avail_decks):
                 set_color(RED)
                 print()
                 print(center_text("Tidak ada deck untuk dikelola"))
-                confirm = input(center_text("Apakah kamu ingin membuka kumpulan deck online (y/n): "))
+                confirm = read_line(center_text("Apakah kamu ingin membuka kumpulan deck online (y/n): "))
                 if confirm == 'y':
+                    import webbrowser
                     url = "https://github.com/Stonelynx156/MemoRA_shared-deck"
                     webbrowser.open(url)
                     set_color(WHITE)
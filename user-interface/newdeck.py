@@ -1,6 +1,4 @@
 import os
-import ctypes
-import msvcrt
 import shutil
 from utils.deck import create_deck, load_index,deck_file_path
 from console import (
@@ -22,9 +20,6 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-
 """Deck Baru"""
 def new_deck():
     """
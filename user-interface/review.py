@@ -1,18 +1,16 @@
-import ctypes
-import utils.deck as deck
 import utils.cards as cards
-from datetime import datetime,timezone
-import heapq
-import itertools
-from utils.deck import load_deck, save_deck, save_limit,load_limit
-from utils.cards import card_queue, update_schedule, card_status
+import time
+from utils.deck import save_limit,load_limit, checkpoint
+from utils.cards import due_index, ReviewSession, MultiDeckSession
+from utils.writer import get_writer
+import layout
 
 from console import (
     clear, 
     set_color,
     center_text,
-    read_key,
     wait_for_enter,
+    read_line,
     get_terminal_size,
     wait_for_key_with_resize,
     print_spacer_before_bottom_options,
@@ -29,9 +27,6 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-
 quality_options = [
     "[1] Again",
     "[2] Hard",
@@ -40,13 +35,20 @@ quality_options = [
 ]
 def get_limit(limit):
     try:
-        value = int(input(limit))
+        value = int(read_line(limit))
         return value
     except ValueError:
         return None
 
-def display_question(deck_name, question, status):
+#cetak baris teks kartu yang sudah dipotong, masing-masing rata tengah
+def print_lines(lines):
+    for line in lines:
+        print(center_text(line))
+
+def display_question(deck_name, card, status):
     clear()
+    cols, _ = get_terminal_size()
+    question, _ = layout.wrap_card(card, layout.text_area(cols))
     set_color(BRIGHT | BLUE)
     print(center_text(f"=== {deck_name} ==="))
     set_color(WHITE)
@@ -55,7 +57,7 @@ def display_question(deck_name, question, status):
     set_color(BRIGHT | GREEN)
     print(center_text("PERTANYAAN:"))
     set_color(WHITE)
-    print(center_text(question))
+    print_lines(question)
     print("\n" * 5)    
 
     # Instruksi
@@ -70,24 +72,25 @@ def display_question(deck_name, question, status):
     
     # Buat teks tanpa warna untuk menghitung panjang
     status_text = f"{new_count}   {review_count}   {due_count}"
-    cols, _ = get_terminal_size()
-    padding = (cols - len(status_text)) // 2
+    padding = layout.offset(len(status_text), cols)
 
     print(" " * padding, end="")
     set_color(BRIGHT | GREEN)
-    print(f"{new_count}", end="", flush=True)
+    print(f"{new_count}", end="")
     set_color(WHITE)
-    print("   ", end="", flush=True)
+    print("   ", end="")
     set_color(BRIGHT | RED)
-    print(f"{review_count}", end="", flush=True)
+    print(f"{review_count}", end="")
     set_color(WHITE)
-    print("   ", end="", flush=True)
+    print("   ", end="")
     set_color(BRIGHT | CYAN)
-    print(f"{due_count}", flush=True)
+    print(f"{due_count}")
     set_color(WHITE)
 
-def display_answer(deck_name, question, answer):
+def display_answer(deck_name, card):
     clear()
+    cols, _ = get_terminal_size()
+    question, answer = layout.wrap_card(card, layout.text_area(cols))
     set_color(BRIGHT | BLUE)
     print(center_text(f"=== {deck_name} ==="))
     set_color(WHITE)
@@ -96,15 +99,16 @@ def display_answer(deck_name, question, answer):
     set_color(BRIGHT | GREEN)
     print(center_text("PERTANYAAN:"))
     set_color(WHITE)
-    print(center_text(question))
+    print_lines(question)
     print("\n" * 4)
 
     set_color(BRIGHT | BLUE)
     print(center_text("JAWABAN:"))
     set_color(WHITE)
-    print(center_text(answer))
+    print_lines(answer)
     
-    lines_used = 13
+    #baris tetap layar jawaban + baris teks kartu (13 untuk kartu satu baris)
+    lines_used = 11 + len(question) + len(answer)
     bottom_section_height = 2  
     
     print_spacer_before_bottom_options(lines_used, bottom_section_height)
@@ -137,79 +141,120 @@ def no_review(deck_name):
     set_color(WHITE)
 
 def review_deck(deck_name, new, due, init):
-    prev_size = get_terminal_size()
+    writer = get_writer()
+    try:
+        _review_deck(deck_name, new, due, init, writer)
+    finally:
+        #rating yang masih antri ditulis, lalu journal digabung ke file deck
+        writer.flush()
+        checkpoint(deck_name)
+
+#tampilkan pertanyaan lalu jawaban satu kartu; mengembalikan (rating 0-3 atau None bila keluar,
+#waktu menjawab dalam ms, ukuran terminal)
+def ask_rating(deck_name, card, status, prev_size):
+    display_question(deck_name, card, status)
+    #waktu menjawab dihitung sejak pertanyaan pertama kali tampil
+    shown = time.monotonic()
     show_answer = False
-    cards_raw = load_deck(deck_name)
-    counter = itertools.count()
-    queue = card_queue(deck_name, new, due)
+    while True:
+        key, prev_size = wait_for_key_with_resize(prev_size)
+
+        if key == EXIT_TOKEN:
+            return None, 0, prev_size
+        
+        if key is None:
+            # Terminal di-resize, refresh tampilan
+            if show_answer:
+                display_answer(deck_name, card)
+            else:
+                display_question(deck_name, card, status)
+            continue
+
+        if not show_answer:
+            # State: menampilkan pertanyaan
+            if key == 'SPASI' or key == 'ENTER':
+                show_answer = True
+                display_answer(deck_name, card)
+            elif key == 'ESC':
+                return None, 0, prev_size
+            else:
+                continue
+        
+        else:
+            # State: menampilkan jawaban
+            if key == 'ESC':
+                return None, 0, prev_size
+            elif isinstance(key, tuple) and key[0] == 'CHAR':
+                char = key[1]
+                if char in ['1', '2', '3', '4']:
+                    return int(char) - 1, int((time.monotonic() - shown) * 1000), prev_size
+
+def _review_deck(deck_name, new, due, init, writer):
+    prev_size = get_terminal_size()
+    session = ReviewSession.for_deck(deck_name, new, due)
+    index = due_index(deck_name)
+    #limit dibaca sekali; penulisan berjalan di belakang jadi nilai terbaru disimpan di sini
+    limit = load_limit(deck_name)
     # Tampilkan pertanyaan pertama kali
-    if not queue:
+    if not session:
         no_review(deck_name)
         return
     
-    while queue:
-        status = card_status(queue)
-        _, _, card = heapq.heappop(queue)
-        q = card.front
-        a = card.back
-        display_question(deck_name, q, status)
-        limit = load_limit(deck_name)
-        show_answer = False
-        while True:
-            key, prev_size = wait_for_key_with_resize(prev_size)
-
-            if key == EXIT_TOKEN:
-                return
-            
-            if key is None:
-                # Terminal di-resize, refresh tampilan
-                if show_answer:
-                    display_answer(deck_name, card.front, card.back)
-                else:
-                    display_question(deck_name, card.front, status)
-                continue
+    while session:
+        status = session.status()
+        card = session.pop()
+        quality, latency, prev_size = ask_rating(deck_name, card, status, prev_size)
+        if quality is None:
+            return
+        if card.first_time == True:
+            if limit["due_limit"] is not None and limit["due_limit"]> 0: 
+                new = limit["new_limit"] - 1
+        if card.due <= cards._now_ts() and card.first_time == False:
+            if limit["new_limit"] is not None and limit["new_limit"]> 0 : 
+                due = limit["due_limit"] - 1 
+        kind, prev_interval = cards._status_kind(card), card.interval
+        session.reschedule(card, quality, index)
 
-            if not show_answer:
-                # State: menampilkan pertanyaan
-                if key == 'SPASI' or key == 'ENTER':
-                    show_answer = True
-                    display_answer(deck_name, q, a)
-                elif key == 'ESC':
-                    return
-                else:
-                    continue
-            
-            else:
-                # State: menampilkan jawaban
-                if key == 'ESC':
-                    return
-                elif isinstance(key, tuple) and key[0] == 'CHAR':
-                    char = key[1]
-                    if char in ['1', '2', '3', '4']:
-                        # Handle rating (bisa ditambahkan logika update card di sini)
-                        quality = int(char) - 1
-                        if card.first_time == True:
-                            if limit["due_limit"] is not None and limit["due_limit"]> 0: 
-                                new = limit["new_limit"] - 1
-                        if datetime.fromisoformat(card.due) <= datetime.now(timezone.utc) and card.first_time == False:
-                            if limit["new_limit"] is not None and limit["new_limit"]> 0 : 
-                                due = limit["due_limit"] - 1 
-                        update_schedule(card, quality)
-                        if card.step <= 3:
-                            due_dt = card.due if isinstance(card.due, datetime) else datetime.fromisoformat(card.due)
-                            heapq.heappush(queue, (due_dt,next(counter), card))
-                            
-                        for idx, stored in enumerate(cards_raw):
-                            if stored["id"] == card.id:
-                                cards_raw[idx] = card.to_dict()                        
-                        save_deck(deck_name, cards_raw)
-                        save_limit(deck_name, new, due, init)
-                        break
-                        # Untuk sekarang, kembali ke pertanyaan atau lanjut ke kartu berikutnya   
-    queue = card_queue(deck_name)
+        writer.save_card(deck_name, card.to_dict())
+        writer.log_review(deck_name, card.id, kind, quality, prev_interval, card.interval, latency)
+        writer.save_limit(deck_name, new, due, init)
+        limit = dict(limit, new_limit=new, due_limit=due)
     no_review(deck_name)
     return
 
+#review semua deck sekaligus; deck dimuat saat kartu pertamanya mendapat giliran
+def review_all(deck_names):
+    writer = get_writer()
+    session = MultiDeckSession(deck_names)
+    try:
+        _review_all(session, writer)
+    finally:
+        writer.flush()
+        for deck_name in session.sessions:
+            checkpoint(deck_name)
+
+def _review_all(session, writer):
+    title = "Semua Deck"
+    prev_size = get_terminal_size()
+    if not session:
+        no_review(title)
+        return
+    while session:
+        status = session.status()
+        #deck yang belum dimuat hanya menyumbang batas bawah jatuh tempo
+        if session.estimated():
+            status[2] = f"{status[2]}+"
+        deck_name, card = session.pop()
+        quality, latency, prev_size = ask_rating(f"{title}: {deck_name}", card, status, prev_size)
+        if quality is None:
+            return
+        kind, prev_interval = cards._status_kind(card), card.interval
+        limit = session.reschedule(deck_name, card, quality)
+        writer.save_card(deck_name, card.to_dict())
+        writer.log_review(deck_name, card.id, kind, quality, prev_interval, card.interval, latency)
+        writer.save_limit(deck_name, limit["new_limit"], limit["due_limit"], limit["init"])
+    no_review(title)
+
 def review_menu(deck_name, new, due):
     """Menu review deck - menampilkan statistik dan opsi untuk mulai review"""
     prev_size = get_terminal_size()
@@ -220,7 +265,7 @@ def review_menu(deck_name, new, due):
         init = limit["init"]
         init_new = init[0]
         init_due = init[1]
-        queue = card_queue(deck_name, new, due)
+        status = ReviewSession.for_deck(deck_name, new, due).status()
         clear()
         
         # Header
@@ -236,11 +281,11 @@ def review_menu(deck_name, new, due):
         set_color(WHITE)
         
         set_color(BRIGHT | GREEN)
-        print(center_text(f"Kartu Baru        : {card_status(queue)[0]}"))
+        print(center_text(f"Kartu Baru        : {status[0]}"))
         set_color(BRIGHT | RED)
-        print(center_text(f"Kartu Tinjau      : {card_status(queue)[1]}"))
+        print(center_text(f"Kartu Tinjau      : {status[1]}"))
         set_color(BRIGHT | CYAN)
-        print(center_text(f"Kartu Jatuh Tempo : {card_status(queue)[2]}"))
+        print(center_text(f"Kartu Jatuh Tempo : {status[2]}"))
         set_color(WHITE)
         print()
 
@@ -264,7 +309,6 @@ def review_menu(deck_name, new, due):
 
         # Mulai sesi review
         if key == 'ENTER':
-            print
             review_deck(deck_name, new, due, init)
         elif key == 'TAB':
             clear()
@@ -276,7 +320,7 @@ def review_menu(deck_name, new, due):
             print()
             new_limit = get_limit(center_text("Masukkan Limit Kartu Baru: ")) 
             due_limit = get_limit(center_text("Masukkan Limit Kartu Jatuh Tempo: "))
-            new_day = datetime.fromisoformat(limit["date"]) <= datetime.now(timezone.utc)
+            new_day = limit["date"] <= cards._now_ts()
             new_config, new_remaining = adjust_limit(new_limit, init_new, new, new_day)
             due_config, due_remaining = adjust_limit(due_limit, init_due, due, new_day)
 
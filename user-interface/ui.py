@@ -1,15 +1,8 @@
 import os
-import ctypes
-import msvcrt
-import shutil
-import guide
-import newdeck
-import importdeck
-import managedeck
-import review
 import time
+import layout
 
-from utils.deck import load_index
+from utils.deck import load_index, deck_meta, meta_due_count
 from console import (
     clear, 
     set_color,
@@ -30,17 +23,32 @@ CYAN = GREEN | BLUE
 MAGENTA = RED | BLUE
 BRIGHT = 0x08
 
-STD_OUTPUT_HANDLE = -11
-h = ctypes.windll.kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-
 #Bottom Menu
 menu_options = [
         "Panduan Penggunaan",
         "Buat Deck Baru",
         "Import Deck",
-        "Kelola Deck"
+        "Kelola Deck",
+        "Belajar Semua"
     ]
 
+#jumlah baru / tinjau / jatuh tempo dari metadata di index (file deck tidak dibuka)
+def deck_counts(deck):
+    meta = deck_meta(deck)
+    return meta["new"], meta["learning"], meta_due_count(meta)
+
+#kolom jumlah kartu di samping nama deck, warnanya sama dengan status di layar review
+def print_deck_counts(deck, name_text):
+    new, learning, due = deck_counts(deck)
+    print(" " * max(1, 42 - len(name_text)), end="")
+    set_color(BRIGHT | GREEN)
+    print(f"{new:>6}", end="")
+    set_color(BRIGHT | RED)
+    print(f"{learning:>6}", end="")
+    set_color(BRIGHT | CYAN)
+    print(f"{due:>6}")
+    set_color(WHITE)
+
 """Menu Utama"""
 def main_menu(selected_deck, selected_option, deck_mode):
     clear()
@@ -60,12 +68,13 @@ def main_menu(selected_deck, selected_option, deck_mode):
             if deck_mode and i == selected_deck:
                 set_color(BRIGHT | GREEN)
                 deck_text = f"> {deck} <"
-                print("               " + (deck_text))
-                set_color(WHITE)
+                print("               " + (deck_text), end="")
+                print_deck_counts(deck, deck_text)
             else:
                 set_color(WHITE)
                 deck_text = f"  • {deck}"
-                print("               " + (deck_text))
+                print("               " + (deck_text), end="")
+                print_deck_counts(deck, deck_text)
             lines_used += 1
     else:
         no_deck_text = "  (Belum ada deck)"
@@ -98,8 +107,7 @@ def main_menu(selected_deck, selected_option, deck_mode):
     
     #center options
     total_length = sum(len(text) for text in menu_texts) + (len(menu_texts) - 1) * 2
-    cols, _ = shutil.get_terminal_size()
-    x = (cols - total_length) // 2
+    x = layout.offset(total_length, cols)
 
     print(" " * x, end="")
     for i, text in enumerate(menu_texts):
@@ -156,22 +164,32 @@ def show_menu():
         elif key == 'ENTER':
             clear()
             
+            #modul layar dimuat saat pertama dibuka agar menu utama tampil secepatnya
             if deck_mode and avail_decks:
+                import review
                 deck_name = avail_decks[selected_deck]
                 review.show_review_deck(deck_name)
             elif not deck_mode:
                 opt = menu_options[selected_option]
                 if opt == "Buat Deck Baru":
                     clear()
+                    import newdeck
                     newdeck.new_deck()
                 elif opt == "Import Deck":
                     clear()
+                    import importdeck
                     importdeck.import_deck()
                 elif opt == "Kelola Deck":
                     clear()
+                    import managedeck
                     managedeck.manage_deck(avail_decks)
+                elif opt == "Belajar Semua":
+                    clear()
+                    import review
+                    review.review_all(avail_decks)
                 elif opt == "Panduan Penggunaan":
                     clear()
+                    import guide
                     guide.panduan_penggunaan()
                     print()
         elif key == 'ESC':
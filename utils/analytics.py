@@ -0,0 +1,116 @@
+"""Analitik retensi dari log rating (lihat utils.reviewlog).
+
+Dengan numpy seluruh log dibaca sekali sebagai structured array dan dihitung per kolom;
+tanpa numpy hasilnya sama lewat perulangan python biasa (lebih lambat untuk log besar).
+Retensi dihitung dari rating kartu yang sudah masuk fase review: lulus bila rating bukan Again.
+"""
+from typing import Dict, Iterable, List, Sequence
+
+from utils.reviewlog import RECORD, read_log_bytes, load_columns
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DAY = 86400
+REVIEW = 2
+#batas bawah kelompok interval (hari) untuk retention_by_interval
+INTERVAL_EDGES = (1, 3, 7, 14, 30, 60, 120, 365)
+
+if np is not None:
+    DTYPE = np.dtype([("card", "V16"), ("ts", "<i8"), ("kind", "u1"), ("quality", "u1"),
+                      ("prev", "<f8"), ("next", "<f8"), ("latency", "<u4")])
+    assert DTYPE.itemsize == RECORD.size
+
+#log satu deck: structured array numpy, atau dict kolom array tanpa numpy
+def load_log(deck_name: str):
+    if np is None:
+        return load_columns(deck_name)
+    return np.frombuffer(read_log_bytes(deck_name), dtype=DTYPE)
+
+def _rows(log) -> int:
+    return len(log["ts"])
+
+#jumlah rating dan jumlah lulus per kunci, terurut menurut kunci
+def _group(keys, passed) -> List[Dict]:
+    if np is not None:
+        #kunci berupa bilangan bulat rapat (hari, kelompok interval): cukup bincount, tanpa sort
+        keys = np.asarray(keys, dtype=np.int64)
+        low = int(keys.min()) if len(keys) else 0
+        total = np.bincount(keys - low)
+        ok = np.bincount(keys - low, weights=passed, minlength=len(total))
+        (uniq,) = np.nonzero(total)
+        pairs = zip((uniq + low).tolist(), total[uniq].tolist(), ok[uniq].astype(int).tolist())
+    else:
+        counts: Dict = {}
+        for key, p in zip(keys, passed):
+            row = counts.setdefault(key, [0, 0])
+            row[0] += 1
+            row[1] += p
+        pairs = ((key, n, p) for key, (n, p) in sorted(counts.items()))
+    return [{"key": key, "reviews": n, "passed": p, "retention": p / n} for key, n, p in pairs]
+
+#(kunci, lulus) hanya untuk rating kartu fase review
+def _review_rows(log, keys):
+    if np is not None:
+        mask = log["kind"] == REVIEW
+        return keys[mask], (log["quality"][mask] > 0).astype(np.int64)
+    rows = [(key, int(q > 0)) for key, kind, q in zip(keys, log["kind"], log["quality"]) if kind == REVIEW]
+    return [k for k, _ in rows], [p for _, p in rows]
+
+#jumlah rating per tombol (Again, Hard, Good, Easy) untuk semua rating
+def rating_distribution(log) -> List[int]:
+    if np is not None:
+        return np.bincount(log["quality"], minlength=4)[:4].tolist()
+    counts = [0, 0, 0, 0]
+    for q in log["quality"]:
+        counts[q] += 1
+    return counts
+
+#retensi per hari (hari UTC sejak epoch)
+def retention_by_day(log) -> List[Dict]:
+    days = log["ts"] // DAY if np is not None else [ts // DAY for ts in log["ts"]]
+    rows = _group(*_review_rows(log, days))
+    for row in rows:
+        row["day"] = row.pop("key")
+    return rows
+
+def _bucket_label(i: int, edges: Sequence[int]) -> str:
+    if i == 0:
+        return f"<{edges[0]}"
+    if i == len(edges):
+        return f"{edges[-1]}+"
+    return f"{edges[i - 1]}-{edges[i] - 1}"
+
+#retensi per kelompok interval sebelum rating
+def retention_by_interval(log, edges: Sequence[int] = INTERVAL_EDGES) -> List[Dict]:
+    if np is not None:
+        buckets = np.searchsorted(np.asarray(edges, dtype=np.float64), log["prev"], side="right")
+    else:
+        import bisect
+        buckets = [bisect.bisect_right(edges, prev) for prev in log["prev"]]
+    rows = _group(*_review_rows(log, buckets))
+    for row in rows:
+        row["interval"] = _bucket_label(row.pop("key"), edges)
+    return rows
+
+#ringkasan satu log: retensi, lapse, distribusi rating, rata-rata waktu menjawab
+def summarize(log) -> Dict:
+    distribution = rating_distribution(log)
+    _, passed = _review_rows(log, log["kind"])
+    reviews, ok = len(passed), int(passed.sum() if np is not None else sum(passed))
+    if np is not None:
+        latency = log["latency"][log["latency"] > 0]
+        avg_latency = float(latency.mean()) if len(latency) else None
+    else:
+        latency = [ms for ms in log["latency"] if ms > 0]
+        avg_latency = sum(latency) / len(latency) if latency else None
+    return {"ratings": _rows(log), "again": distribution[0], "hard": distribution[1],
+            "good": distribution[2], "easy": distribution[3], "reviews": reviews,
+            "lapses": reviews - ok, "retention": ok / reviews if reviews else None,
+            "avg_latency_ms": avg_latency}
+
+#ringkasan per deck
+def retention_by_deck(deck_names: Iterable[str]) -> List[Dict]:
+    return [dict(summarize(load_log(name)), deck=name) for name in deck_names]
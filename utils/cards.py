@@ -1,28 +1,73 @@
+import os
 import uuid
-from dataclasses import dataclass, asdict
+import sys
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime, timezone,timedelta
-from typing import Dict
-from utils.deck import load_deck, save_deck
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.deck import (load_deck, save_deck, save_card, load_queue_cards, load_params, load_limit,
+                        cached_deck, deck_extras, add_save_listener, deck_meta, meta_due_count, to_epoch,
+                        _locked)
+from utils import clock
+import bisect
 import heapq
 import itertools
+import threading
 
 
 counter = itertools.count()
 steps = {1: timedelta(minutes=1),
          2: timedelta(minutes=6),
          3: timedelta(minutes=10)}
+DAY = 86400
+#jeda learning step 1-3 dalam detik, default SchedulerParams.steps
+STEP_SECONDS = tuple(int(steps[i].total_seconds()) for i in (1, 2, 3))
 
 def _now() -> datetime:
-    return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(clock.now(), timezone.utc)
 
-def human_date(iso_ts: str) -> str:
+#waktu sekarang dalam detik epoch (lihat utils.clock), format yang dipakai Card.due
+def _now_ts() -> int:
+    return clock.now()
+
+#format tanggal hanya saat ditampilkan; menerima epoch atau string ISO lama
+def human_date(ts) -> str:
     try:
-        dt = datetime.fromisoformat(iso_ts)
-    except ValueError:
-        return iso_ts
-    return dt.astimezone().strftime("%d-%m-%Y %H:%M:%S")
+        epoch = to_epoch(ts)
+    except (TypeError, ValueError):
+        return ts
+    return datetime.fromtimestamp(epoch, timezone.utc).astimezone().strftime("%d-%m-%Y %H:%M:%S")
+
+CARD_FIELDS = ("id", "front", "back", "interval", "ease_factor", "step", "due", "first_time")
+
+@dataclass(frozen=True)
+class SchedulerParams:
+    """Konstanta SM-2 modifikasi yang dipakai update_schedule; bisa di-fit per deck (utils.optimizer)."""
+    hard_ease: float = 0.15
+    easy_ease: float = 0.15
+    hard_factor: float = 1.2
+    easy_bonus: float = 1.3
+    #jeda learning step 1-3 dalam detik
+    steps: Tuple[int, int, int] = STEP_SECONDS
 
-@dataclass
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict]) -> "SchedulerParams":
+        if not raw:
+            return DEFAULT_PARAMS
+        return cls(**dict(raw, steps=tuple(raw.get("steps", DEFAULT_PARAMS.steps))))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"hard_ease": self.hard_ease, "easy_ease": self.easy_ease, "hard_factor": self.hard_factor,
+                "easy_bonus": self.easy_bonus, "steps": list(self.steps)}
+
+DEFAULT_PARAMS = SchedulerParams()
+
+#parameter scheduler deck, default bila belum pernah di-fit
+def deck_params(deck_name: str) -> SchedulerParams:
+    return SchedulerParams.from_dict(load_params(deck_name))
+
+@dataclass(slots=True)
 class Card:
     id : str
     front : str
@@ -30,15 +75,19 @@ class Card:
     interval : int = 1
     ease_factor : float = 2.5
     step : int = 1
-    due : str = _now().isoformat()
+    due : int = field(default_factory=_now_ts)
     first_time : bool = True
 
     @classmethod
     def from_dict(self, raw:Dict[str, object]) -> "Card":
+        if not isinstance(raw.get("due", 0), int):
+            raw = dict(raw, due=to_epoch(raw["due"]))
         return self(**raw)
     
     def to_dict(self) -> Dict[str, object]:
-        return asdict(self)
+        return {"id": self.id, "front": self.front, "back": self.back, "interval": self.interval,
+                "ease_factor": self.ease_factor, "step": self.step, "due": self.due,
+                "first_time": self.first_time}
     
     @classmethod
     def new(self, front: str, back: str) -> "Card":
@@ -46,42 +95,316 @@ class Card:
             id = str(uuid.uuid4()),
             front = front,
             back = back,
-            due = _now().isoformat(),
+            due = _now_ts(),
             first_time = True
         )
     
 
 
+#perkiraan byte per kartu di luar kolom dan buffer teks: string id (uuid), slot list, entri dict posisi
+ROW_OVERHEAD = 165
+
+class CardTable:
+    """Tabel kartu kolumnar: angka di array, id ter-intern, front/back dalam satu buffer utf-8.
+
+    Dipakai utils.deck.Deck sebagai satu-satunya salinan kartu di cache; objek Card (card/get)
+    dan dict kartu (row) hanya dibuat saat diminta, perubahan ditulis balik dengan set().
+    """
+
+    def __init__(self, cards: Iterable = ()):
+        self.ids: List[str] = []
+        self.interval = array("d")
+        self.ease_factor = array("d")
+        self.step = array("b")
+        self.due = array("q")
+        self.first_time = array("b")
+        #teks kartu ke-i: _text[text_start[i]:] sepanjang front_len[i] lalu back_len[i] byte;
+        #teks lama yang diganti set() tetap di buffer sampai deck dibaca/ditulis ulang
+        self._text = bytearray()
+        self.text_start = array("q")
+        self.front_len = array("I")
+        self.back_len = array("I")
+        self._positions: Dict[str, int] = {}
+        for card in cards:
+            self.append(card)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self._positions
+
+    #nilai kolom dari Card atau dict kartu (field yang tidak ada memakai default Card)
+    @staticmethod
+    def _values(card) -> tuple:
+        if isinstance(card, Card):
+            return (card.id, card.front, card.back, card.interval, card.ease_factor, card.step,
+                    card.due, card.first_time)
+        due = card["due"] if "due" in card else _now_ts()
+        return (card["id"], card["front"], card["back"], card.get("interval", 1),
+                card.get("ease_factor", 2.5), card.get("step", 1),
+                due if isinstance(due, int) else to_epoch(due), card.get("first_time", True))
+
+    def _add_text(self, front: bytes, back: bytes) -> int:
+        start = len(self._text)
+        self._text += front
+        self._text += back
+        return start
+
+    #menerima Card atau dict kartu
+    def append(self, card) -> None:
+        cid, front, back, interval, ease, step, due, first = self._values(card)
+        front, back = front.encode("utf-8"), back.encode("utf-8")
+        self._positions[cid] = len(self.ids)
+        self.ids.append(sys.intern(cid))
+        self.text_start.append(self._add_text(front, back))
+        self.front_len.append(len(front))
+        self.back_len.append(len(back))
+        self.interval.append(interval)
+        self.ease_factor.append(ease)
+        self.step.append(step)
+        self.due.append(due)
+        self.first_time.append(first)
+
+    def _texts(self, i: int) -> Tuple[bytes, bytes]:
+        start = self.text_start[i]
+        mid = start + self.front_len[i]
+        return bytes(self._text[start:mid]), bytes(self._text[mid:mid + self.back_len[i]])
+
+    def position(self, card_id: str) -> Optional[int]:
+        return self._positions.get(card_id)
+
+    def _interval(self, i: int):
+        interval = self.interval[i]
+        return int(interval) if interval.is_integer() else interval
+
+    def card(self, i: int) -> Card:
+        front, back = self._texts(i)
+        return Card(self.ids[i], front.decode("utf-8"), back.decode("utf-8"), self._interval(i),
+                    self.ease_factor[i], self.step[i], self.due[i], bool(self.first_time[i]))
+
+    #dict kartu baru (bentuk yang sama dengan file json), tanpa lewat objek Card
+    def row(self, i: int) -> Dict[str, object]:
+        front, back = self._texts(i)
+        return {"id": self.ids[i], "front": front.decode("utf-8"), "back": back.decode("utf-8"),
+                "interval": self._interval(i), "ease_factor": self.ease_factor[i], "step": self.step[i],
+                "due": self.due[i], "first_time": bool(self.first_time[i])}
+
+    def get(self, card_id: str) -> Optional[Card]:
+        i = self._positions.get(card_id)
+        return None if i is None else self.card(i)
+
+    #menulis balik Card/dict ke kolom; kartu yang belum ada ditambahkan
+    def set(self, card) -> None:
+        values = self._values(card)
+        i = self._positions.get(values[0])
+        if i is None:
+            self.append(card)
+            return
+        _, front, back, interval, ease, step, due, first = values
+        front, back = front.encode("utf-8"), back.encode("utf-8")
+        #rating tidak mengubah teks, jadi buffer hanya bertambah saat kartu diedit
+        if (front, back) != self._texts(i):
+            self.text_start[i] = self._add_text(front, back)
+            self.front_len[i] = len(front)
+            self.back_len[i] = len(back)
+        self.interval[i] = interval
+        self.ease_factor[i] = ease
+        self.step[i] = step
+        self.due[i] = due
+        self.first_time[i] = first
+
+    #menghapus kartu dan menggeser kartu sesudahnya (urutan tetap), O(n)
+    def delete(self, card_id: str) -> bool:
+        i = self._positions.pop(card_id, None)
+        if i is None:
+            return False
+        for column in (self.ids, self.text_start, self.front_len, self.back_len, self.interval,
+                       self.ease_factor, self.step, self.due, self.first_time):
+            del column[i]
+        for j in range(i, len(self.ids)):
+            self._positions[self.ids[j]] = j
+        return True
+
+    def __iter__(self):
+        return (self.card(i) for i in range(len(self.ids)))
+
+    #perkiraan memori tabel (byte), dipakai untuk budget cache deck
+    def nbytes(self) -> int:
+        columns = (self.interval, self.ease_factor, self.step, self.due, self.first_time,
+                   self.text_start, self.front_len, self.back_len)
+        return len(self._text) + sum(c.itemsize * len(c) for c in columns) + len(self.ids) * ROW_OVERHEAD
+
+    def rows(self):
+        return (self.row(i) for i in range(len(self.ids)))
+
+    def to_dicts(self) -> List[Dict]:
+        return [self.row(i) for i in range(len(self.ids))]
+
+#tabel kolumnar deck: di jalur json milik Deck di cache (jangan diubah langsung, lewat save_card),
+#di sqlite dibangun dari baris deck
+def card_table(deck_name: str) -> CardTable:
+    if deck_extras(deck_name) is None:
+        return CardTable(load_deck(deck_name))
+    return cached_deck(deck_name).table
+
+def _due_ts(card: Card) -> int:
+    return card.due
+
+class DueIndex:
+    """Index jadwal satu deck: kartu baru, learning, dan review terurut menurut due (epoch)."""
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        #update bisa datang dari thread penulis (utils.writer) lewat listener save_card
+        self._lock = threading.RLock()
+        self.new: Dict[str, None] = {}
+        self.learning: Dict[str, float] = {}
+        self._review_due: Dict[str, float] = {}
+        for card in cards:
+            self._add(card, sort=False)
+        self.review: List[Tuple[float, str]] = sorted((ts, cid) for cid, ts in self._review_due.items())
+
+    #partisi sama dengan aturan card_queue
+    def _add(self, card: Card, sort: bool = True) -> None:
+        if card.step == 1 and card.first_time == True:
+            self.new[card.id] = None
+        elif card.step < 4:
+            self.learning[card.id] = _due_ts(card)
+        else:
+            ts = _due_ts(card)
+            self._review_due[card.id] = ts
+            if sort:
+                bisect.insort(self.review, (ts, card.id))
+
+    def remove(self, card_id: str) -> None:
+        with self._lock:
+            self.new.pop(card_id, None)
+            self.learning.pop(card_id, None)
+            ts = self._review_due.pop(card_id, None)
+            if ts is not None:
+                i = bisect.bisect_left(self.review, (ts, card_id))
+                if i < len(self.review) and self.review[i] == (ts, card_id):
+                    del self.review[i]
+
+    #dipanggil setiap jadwal kartu berubah: O(log n) untuk mencari posisi baru
+    def update(self, card: Card) -> None:
+        with self._lock:
+            self.remove(card.id)
+            self._add(card)
+
+    def new_ids(self, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            return list(itertools.islice(self.new, limit))
+
+    def learning_ids(self) -> List[str]:
+        with self._lock:
+            return list(self.learning)
+
+    #id kartu review yang sudah jatuh tempo, paling lama terlambat lebih dulu
+    def due_ids(self, now_ts: float, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            end = bisect.bisect_right(self.review, now_ts, key=lambda entry: entry[0])
+            if limit is not None:
+                end = min(end, limit)
+            return [cid for _, cid in self.review[:end]]
+
+#index jatuh tempo deck; dibangun sekali lalu disimpan bersama deck di cache (None untuk sqlite)
+@_locked
+def due_index(deck_name: str) -> Optional[DueIndex]:
+    extras = deck_extras(deck_name)
+    if extras is None:
+        return None
+    if "due_index" not in extras:
+        extras["due_index"] = DueIndex(cached_deck(deck_name).table)
+    return extras["due_index"]
+
+#kartu yang disimpan lewat save_card (rating, edit, kartu baru) ikut memperbarui index;
+#di bawah lock deck seperti save_card, karena bisa dipanggil dari thread penulis (utils.writer)
+@_locked
+def _on_card_saved(deck_name: str, old: Optional[Dict], card: Dict) -> None:
+    extras = deck_extras(deck_name)
+    if extras is not None and "due_index" in extras:
+        extras["due_index"].update(Card.from_dict(card))
+
+add_save_listener(_on_card_saved)
+
 #card scheduling algorithm modified SM-2
-def update_schedule(card: Card, quality: int) -> None:
-    now = _now()
+#sebar due kartu review ke hari yang paling sepi di sekitar jadwalnya (MEMORA_LOAD_BALANCE=1)
+LOAD_BALANCE = os.environ.get("MEMORA_LOAD_BALANCE", "0").lower() in ("1", "true", "on")
+#jendela fuzz: +-FUZZ_RATIO x interval (minimal 1, maksimal MAX_FUZZ_DAYS hari); interval pendek tidak di-fuzz
+FUZZ_RATIO = 0.1
+MAX_FUZZ_DAYS = 10
+MIN_FUZZ_INTERVAL = 3
+
+class DueBalancer:
+    """Jumlah kartu review per hari (UTC) satu deck, dipakai update_schedule untuk memilih hari due.
+
+    Dibangun sekali dari due_days di deck_meta, lalu diperbarui per kartu yang dijadwalkan ulang.
+    """
+
+    def __init__(self, due_days: Dict):
+        self.counts = Counter({int(day): count for day, count in due_days.items()})
+
+    @classmethod
+    def for_deck(cls, deck_name: str) -> "DueBalancer":
+        return cls(deck_meta(deck_name)["due_days"])
+
+    #due dengan jam yang sama pada hari tersepi di jendela fuzz; seri dipilih yang terdekat ke jadwal
+    def pick(self, due: int, interval: float, now: int) -> int:
+        if interval < MIN_FUZZ_INTERVAL:
+            return due
+        day = due // DAY
+        fuzz = min(MAX_FUZZ_DAYS, max(1, round(interval * FUZZ_RATIO)))
+        first = max(day - fuzz, now // DAY + 1)
+        best = min(range(first, day + fuzz + 1), key=lambda d: (self.counts[d], abs(d - day), d))
+        return due + (best - day) * DAY
+
+    #kartu review pindah dari old_due ke new_due (None = bukan kartu review)
+    def move(self, old_due: Optional[int], new_due: Optional[int]) -> None:
+        if old_due is not None:
+            day = old_due // DAY
+            self.counts[day] -= 1
+            if self.counts[day] <= 0:
+                del self.counts[day]
+        if new_due is not None:
+            self.counts[new_due // DAY] += 1
+
+def update_schedule(card: Card, quality: int, index: Optional[DueIndex] = None,
+                    params: SchedulerParams = DEFAULT_PARAMS, balancer: Optional[DueBalancer] = None) -> None:
+    now = _now_ts()
+    old_due = card.due if _status_kind(card) == 2 else None
 
     if quality <0 or quality > 3:
         raise ValueError("Quality must be between 0 and 3")
     else:
         if (quality == 0 or card.step < 3) and quality < 3:
-            learning_steps(card, quality)
+            learning_steps(card, quality, params)
         else:
             card.step = 4
-            due = now + timedelta(days=card.interval)
-            card.due = due.isoformat()
+            card.due = now + card.interval * DAY
+            if balancer is not None:
+                card.due = balancer.pick(card.due, card.interval, now)
             if quality == 1:
-                card.ease_factor -= 0.15
-                card.interval = card.interval * 1.2
+                card.ease_factor -= params.hard_ease
+                card.interval = card.interval * params.hard_factor
             elif quality == 2:
                 card.interval = card.interval * card.ease_factor
             else:
-                card.ease_factor += 0.15
-                card.interval = card.interval * card.ease_factor * 1.3
+                card.ease_factor += params.easy_ease
+                card.interval = card.interval * card.ease_factor * params.easy_bonus
             card.ease_factor = max(1.3, card.ease_factor)
             card.interval = round(card.interval)
     card.first_time = False
+    if balancer is not None:
+        balancer.move(old_due, card.due if card.step >= 4 else None)
+    if index is not None:
+        index.update(card)
 
 #learning session & lapses
-def learning_steps(card: Card, quality: int) -> None:
+def learning_steps(card: Card, quality: int, params: SchedulerParams = DEFAULT_PARAMS) -> None:
 
-    now = _now()
-    if card.step < len(steps):
+    now = _now_ts()
+    if card.step < len(params.steps):
         if quality < 0 or quality > 2:
             raise ValueError("qualitty must be between 0 to 3")
         if quality == 0:
@@ -94,29 +417,44 @@ def learning_steps(card: Card, quality: int) -> None:
             card.step = 3
         card.interval = 1
     step = min(card.step, 3)
-    due = now + steps[step]
-    card.due = due.isoformat()
+    card.due = now + params.steps[step - 1]
     card.first_time = False
 
 #add new card into decks
 def add_card(front, back, deck_name: str):
-    deck = load_deck(deck_name)
     card = Card.new(front = front, back = back)
-    deck.append(card.to_dict())
-    save_deck(deck_name, deck)
+    save_card(deck_name, card.to_dict())
+
+def _limit(value: Optional[int]) -> Optional[int]:
+    if value is None:
+        return None
+    return max(value, 0)
 
 #start studying session
 def card_queue(deck_name: str, new_limit: int = 9999, due_limit: int = 9999):
-    cards_raw = load_deck(deck_name)
+    now = _now_ts()
+    index = due_index(deck_name)
+    if index is not None:
+        #hanya kartu yang masuk sesi yang diambil dan di-parse: O(k log n)
+        table = cached_deck(deck_name).table
+        ids = (index.new_ids(_limit(new_limit)) + index.learning_ids()
+               + index.due_ids(now, _limit(due_limit)))
+        session_cards = []
+        for cid in ids:
+            c = table.get(cid)
+            heapq.heappush(session_cards, (c.due, next(counter), c))
+        return session_cards
+
+    #backend sqlite: baris sudah disaring oleh query
+    cards_raw = load_queue_cards(deck_name, now)
     cards = [Card.from_dict(c) for c in cards_raw]
-    now = _now()
     
     new_cards = []
     due_cards = []
 
     session_cards = []
     for c in cards:
-        due_dt = datetime.fromisoformat(c.due)
+        due_dt = c.due
         if c.step == 1 and c.first_time == True:
             new_cards.append((due_dt, c))
         elif due_dt <= now and c.step >= 4:
@@ -137,23 +475,302 @@ def card_queue(deck_name: str, new_limit: int = 9999, due_limit: int = 9999):
 
     return session_cards
 
+#kategori status kartu: 0 = baru, 1 = tinjau (learning), 2 = jatuh tempo (review)
+def _status_kind(card: Card) -> int:
+    if card.first_time == True:
+        return 0
+    if card.step < 4:
+        return 1
+    return 2
+
+class ReviewSession:
+    """Antrian sesi review (heap) dengan counter baru/tinjau/jatuh tempo yang diperbarui saat push/pop."""
+
+    def __init__(self, queue: Optional[List[Tuple]] = None, params: SchedulerParams = DEFAULT_PARAMS,
+                 balancer: Optional[DueBalancer] = None):
+        self._heap = queue if queue is not None else []
+        self.params = params
+        self.balancer = balancer
+        heapq.heapify(self._heap)
+        self._counts = [0, 0, 0]
+        for _, _, card in self._heap:
+            self._counts[_status_kind(card)] += 1
+
+    @classmethod
+    def for_deck(cls, deck_name: str, new_limit: int = 9999, due_limit: int = 9999) -> "ReviewSession":
+        balancer = DueBalancer.for_deck(deck_name) if LOAD_BALANCE else None
+        return cls(card_queue(deck_name, new_limit, due_limit), deck_params(deck_name), balancer)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def push(self, card: Card) -> None:
+        heapq.heappush(self._heap, (card.due, next(counter), card))
+        self._counts[_status_kind(card)] += 1
+
+    def pop(self) -> Card:
+        _, _, card = heapq.heappop(self._heap)
+        self._counts[_status_kind(card)] -= 1
+        return card
+
+    #due kartu berikutnya tanpa mengeluarkannya
+    def next_due(self) -> int:
+        return self._heap[0][0]
+
+    #update jadwal kartu yang sudah di-pop; kartu learning masuk lagi ke antrian
+    def reschedule(self, card: Card, quality: int, index: Optional[DueIndex] = None) -> None:
+        update_schedule(card, quality, index, self.params, self.balancer)
+        if card.step <= 3:
+            self.push(card)
+
+    #[baru, tinjau, jatuh tempo] dalam O(1)
+    def status(self) -> List[int]:
+        return list(self._counts)
+
+#limit None berarti tanpa batas
+def _cap(value: Optional[int]) -> float:
+    return float("inf") if value is None else max(value, 0)
+
+class MultiDeckSession:
+    """Sesi review gabungan beberapa deck: kartu diambil menurut due dari semua deck (k-way merge).
+
+    Deck yang belum dimuat masuk heap dengan batas bawah due dari metadata index (deck_meta), lalu
+    baru dimuat lewat ReviewSession.for_deck sesuai limit deck saat batas bawah itu sampai di puncak.
+    """
+
+    def __init__(self, deck_names: Iterable[str], now: Optional[int] = None):
+        now = _now_ts() if now is None else now
+        #(due atau batas bawah due, urutan deck, nama deck); satu entri per deck yang masih punya kartu
+        self._heap: List[Tuple] = []
+        self._order: Dict[str, int] = {}
+        self.sessions: Dict[str, ReviewSession] = {}
+        self.indexes: Dict[str, Optional[DueIndex]] = {}
+        self.limits: Dict[str, Dict] = {}
+        #perkiraan [baru, tinjau, jatuh tempo] deck yang belum dimuat, dari metadata. Review hanya
+        #tercatat per hari (UTC), jadi yang dihitung hanya hari sebelum hari ini: batas bawah
+        #jumlah due <= now yang nanti diambil card_queue, tidak pernah lebih besar
+        self._estimates: Dict[str, List[int]] = {}
+        for order, name in enumerate(deck_names):
+            meta = deck_meta(name)
+            limit = meta.get("limit") or load_limit(name)
+            new = int(min(meta["new"], _cap(limit["new_limit"])))
+            due = int(min(meta_due_count(meta, now - DAY), _cap(limit["due_limit"])))
+            #deck tetap ikut bila ada review yang jatuh tempo hari ini
+            if not (new or meta["learning"] or meta_due_count(meta, now)):
+                continue
+            bounds = []
+            if meta["next_due"] is not None and (meta["learning"] or meta["review"]):
+                bounds.append(meta["next_due"])
+            if new:
+                bounds.append(meta.get("new_due") or 0)
+            self._order[name] = order
+            self.limits[name] = dict(limit)
+            self._estimates[name] = [new, meta["learning"], due]
+            heapq.heappush(self._heap, (min(bounds, default=0), order, name))
+
+    def _load(self, name: str) -> ReviewSession:
+        limit = self.limits[name]
+        session = ReviewSession.for_deck(name, limit["new_limit"], limit["due_limit"])
+        self.sessions[name] = session
+        self.indexes[name] = due_index(name)
+        del self._estimates[name]
+        return session
+
+    def _push(self, name: str) -> None:
+        session = self.sessions[name]
+        if session:
+            heapq.heappush(self._heap, (session.next_due(), self._order[name], name))
+
+    #deck pemilik kartu paling awal; deck yang batas bawahnya di puncak dimuat dulu
+    def _top(self) -> Optional[str]:
+        while self._heap:
+            name = self._heap[0][2]
+            if name in self.sessions:
+                return name
+            heapq.heappop(self._heap)
+            self._load(name)
+            self._push(name)
+        return None
+
+    def __bool__(self) -> bool:
+        return self._top() is not None
+
+    #deck dan kartu berikutnya; deck masuk heap lagi lewat reschedule
+    def pop(self) -> Tuple[str, Card]:
+        name = self._top()
+        if name is None:
+            raise IndexError("pop from empty MultiDeckSession")
+        heapq.heappop(self._heap)
+        return name, self.sessions[name].pop()
+
+    #rating kartu hasil pop: counter limit deck dikurangi, jadwal diperbarui; mengembalikan limit deck
+    def reschedule(self, name: str, card: Card, quality: int) -> Dict:
+        limit = self.limits[name]
+        if card.first_time and limit["new_limit"]:
+            limit["new_limit"] -= 1
+        elif card.step >= 4 and card.due <= _now_ts() and limit["due_limit"]:
+            limit["due_limit"] -= 1
+        self.sessions[name].reschedule(card, quality, self.indexes[name])
+        self._push(name)
+        return limit
+
+    #True selama masih ada deck yang belum dimuat (jatuh tempo di status() masih batas bawah)
+    def estimated(self) -> bool:
+        return bool(self._estimates)
+
+    #[baru, tinjau, jatuh tempo] dari deck yang sudah dimuat ditambah perkiraan deck lainnya
+    def status(self) -> List[int]:
+        total = [0, 0, 0]
+        for counts in itertools.chain((s.status() for s in self.sessions.values()), self._estimates.values()):
+            for i, count in enumerate(counts):
+                total[i] += count
+        return total
+
 def card_status(queue):
-    new_card = sum(1 for c in queue if getattr(c[2], "first_time") == True)
-    review = sum(1 for c in queue if getattr(c[2], "first_time") == False and getattr(c[2], "step")<= 4 )
-    due = sum(1 for c in queue if getattr(c[2], "first_time") == False and getattr(c[2], "step")>= 4
-              and datetime.isoformat(getattr(c[2], "due"))<= datetime.now(timezone.utc))
-    y = [new_card, review, due]
+    if isinstance(queue, ReviewSession):
+        return queue.status()
+    y = [0, 0, 0]
+    for _, _, card in queue:
+        y[_status_kind(card)] += 1
     return y
         
 def reset_due(deck_name: str):
     raw_cards = load_deck(deck_name)
     cards = [Card.from_dict(c) for c in raw_cards]
-    now = _now()
+    now = _now_ts()
     for c in cards:
-        c.due = now.isoformat()
+        c.due = now
         c.first_time = True
         c.interval = 1
         c.step = 1
         c.ease_factor = 2.5
     cards = [Card.to_dict(c) for c in cards]
     save_deck(deck_name, cards)
+
+#peluang rating Again/Hard/Good/Easy untuk simulasi forecast bila tidak diberikan
+FORECAST_RATINGS = (0.1, 0.15, 0.6, 0.15)
+
+#perkiraan jumlah review per hari untuk `days` hari ke depan (hari 0 = hari ini, UTC).
+#runs = 0: hanya dari due kartu sekarang (kartu terlambat dihitung hari ini).
+#runs > 0: rata-rata `runs` simulasi Monte Carlo update_schedule dengan parameter deck. Langkah learning
+#dalam satu hari digabung menjadi satu review yang lulus seperti rating Good; kartu review yang
+#di-Again muncul lagi besok dengan interval tetap. Kartu baru tidak ikut dihitung.
+def forecast(deck_name: str, days: int = 30, runs: int = 0, ratings: Iterable[float] = FORECAST_RATINGS,
+             seed: Optional[int] = None, now: Optional[int] = None) -> List[float]:
+    now = _now_ts() if now is None else now
+    params = deck_params(deck_name)
+    try:
+        import numpy as np
+    except ImportError:
+        return _forecast_py(_seen_cards(deck_name), days, runs, list(ratings), seed, now, params)
+
+    due, interval, ease, step = _seen_columns(deck_name, np)
+    due_day = due // DAY - now // DAY
+    np.maximum(due_day, 0, out=due_day)
+    if not runs:
+        return np.bincount(due_day[due_day < days], minlength=days).tolist()
+
+    #kartu yang due-nya di luar horizon tidak pernah dihitung
+    upcoming = due_day < days
+    due_day = due_day[upcoming]
+    interval = interval[upcoming]
+    ease = ease[upcoming]
+    learning = step[upcoming] < 4
+    cumulative = np.cumsum(np.asarray(ratings, dtype=np.float64) / sum(ratings))
+    rng = np.random.default_rng(seed)
+    #perubahan ease dan pengali interval per rating (lihat update_schedule)
+    ease_delta = np.array([0.0, -params.hard_ease, 0.0, params.easy_ease])
+    easy_bonus = np.array([1.0, 1.0, 1.0, params.easy_bonus])
+    counts = np.zeros(days)
+    #antrian per hari berisi potongan array index kartu, sehingga tiap hari hanya kartu yang due disentuh
+    def schedule(buckets, idx, day_of):
+        idx = idx[day_of[idx] < days]
+        #kunci 16 bit agar argsort stable memakai radix sort
+        key = day_of[idx].astype(np.int16 if days < 2 ** 15 else np.int32)
+        idx = idx[np.argsort(key, kind="stable")]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(key, minlength=days))))
+        for day in np.flatnonzero(np.diff(bounds)).tolist():
+            buckets[day].append(idx[bounds[day]:bounds[day + 1]])
+
+    for _ in range(runs):
+        day_of, iv, ef, lrn = due_day.copy(), interval.copy(), ease.copy(), learning.copy()
+        buckets = [[] for _ in range(days)]
+        schedule(buckets, np.arange(len(day_of)), day_of)
+        for day in range(days):
+            if not buckets[day]:
+                continue
+            idx = np.concatenate(buckets[day])
+            buckets[day] = None
+            counts[day] += len(idx)
+            q = np.minimum(np.searchsorted(cumulative, rng.random(len(idx)), side="right"), 3)
+            i, e, l = iv[idx], ef[idx], lrn[idx]
+            #learning: lulus hari itu (interval 1, due besok); lapse: due besok, interval dan ease tetap
+            lapse = ~l & (q == 0)
+            #due memakai interval sebelum dikali, sama seperti update_schedule
+            day_of[idx] = day + np.where(l | lapse, 1, i.astype(np.int64))
+            e_next = np.where(l, e, e + ease_delta[q])
+            i = np.select([l, lapse], [e, i], i * np.where(q == 1, params.hard_factor, e_next * easy_bonus[q]))
+            iv[idx] = np.round(i)
+            ef[idx] = np.where(lapse, e, np.maximum(1.3, e_next))
+            lrn[idx] = False
+            schedule(buckets, idx, day_of)
+    return (counts / runs).tolist()
+
+#kolom tabel dibaca di bawah lock deck karena thread penulis (utils.writer) bisa mengubahnya;
+#hasilnya salinan, jadi buffer array tidak tertahan selama simulasi
+
+#(due, interval, ease, step) kartu yang sudah pernah direview sebagai array numpy
+@_locked
+def _seen_columns(deck_name: str, np) -> Tuple:
+    table = card_table(deck_name)
+    seen = np.frombuffer(table.first_time, dtype=np.int8) == 0
+    return tuple(np.frombuffer(column, dtype=dtype)[seen] for column, dtype in
+                 ((table.due, np.int64), (table.interval, np.float64),
+                  (table.ease_factor, np.float64), (table.step, np.int8)))
+
+#(due, interval, ease, step) kartu yang sudah pernah direview, tanpa numpy
+@_locked
+def _seen_cards(deck_name: str) -> List[Tuple[int, float, float, int]]:
+    table = card_table(deck_name)
+    return [(due, interval, ease, step) for due, interval, ease, step, first in
+            zip(table.due, table.interval, table.ease_factor, table.step, table.first_time) if not first]
+
+#forecast tanpa numpy dengan aturan yang sama, per kartu (lambat untuk deck besar)
+def _forecast_py(seen: List[Tuple], days: int, runs: int, ratings: List[float],
+                 seed: Optional[int], now: int, params: SchedulerParams = DEFAULT_PARAMS) -> List[float]:
+    import random
+    today = now // DAY
+    cards = [(max(0, due // DAY - today), interval, ease, step < 4) for due, interval, ease, step in seen]
+    if not runs:
+        counts = [0] * days
+        for day, _, _, _ in cards:
+            if day < days:
+                counts[day] += 1
+        return counts
+    rng = random.Random(seed)
+    counts = [0.0] * days
+    for _ in range(runs):
+        buckets: Dict[int, List] = {}
+        for day, i, e, learning in cards:
+            if day < days:
+                buckets.setdefault(day, []).append((i, e, learning))
+        for day in range(days):
+            for i, e, learning in buckets.pop(day, ()):
+                counts[day] += 1
+                q = rng.choices(range(4), ratings)[0]
+                if learning:
+                    nxt, i = day + 1, e
+                elif q == 0:
+                    nxt = day + 1
+                else:
+                    nxt = day + int(i)
+                    e += -params.hard_ease if q == 1 else params.easy_ease if q == 3 else 0.0
+                    i = (i * params.hard_factor if q == 1 else i * e if q == 2
+                         else i * e * params.easy_bonus)
+                    e = max(1.3, e)
+                if nxt < days:
+                    buckets.setdefault(nxt, []).append((float(round(i)), e, False))
+    return [c / runs for c in counts]
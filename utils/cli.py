@@ -0,0 +1,362 @@
+"""Perintah MemoRA tanpa tampilan interaktif, untuk script dan batch job.
+
+Contoh:
+    python MemoRA.py add "Biologi" --front "Sel" --back "Unit terkecil kehidupan"
+    python MemoRA.py add "Biologi" --file kartu.tsv      (satu kartu per baris: depan<TAB>belakang)
+    python MemoRA.py import deck.json --name "Biologi"
+    python MemoRA.py export "Biologi" deck.json
+    python MemoRA.py stats --json
+    python MemoRA.py due "Biologi"
+    python MemoRA.py reset "Biologi"
+    python MemoRA.py review "Biologi" --stdin < rating.txt (satu rating 1-4 per baris)
+    python MemoRA.py retention "Biologi" --by interval
+    python MemoRA.py forecast --days 30 --runs 5
+    python MemoRA.py optimize "Biologi" --workers 4
+    python MemoRA.py --profile-startup [--budget-ms 150]
+
+Modul ini hanya memakai utils.deck/utils.cards, tidak memuat console atau tkinter.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.deck import (load_index, create_deck, load_deck, save_deck, load_limit, open_deck,
+                        checkpoint, deck_meta)
+from utils.cards import (Card, ReviewSession, add_card, reset_due, due_index, forecast, _now_ts,
+                         _status_kind)
+from utils.writer import WriteBehind
+from utils.stats import deck_summary
+
+class CliError(Exception):
+    """Kesalahan input perintah; pesan ditulis ke stderr dengan exit code 1."""
+
+def _deck_names() -> List[str]:
+    return load_index().get("decks", [])
+
+def _require_deck(name: str) -> None:
+    if name not in _deck_names():
+        raise CliError(f"Deck '{name}' tidak ditemukan")
+
+#deck yang diminta, atau semua deck bila kosong
+def _select_decks(names: List[str]) -> List[str]:
+    for name in names:
+        _require_deck(name)
+    return names or sorted(_deck_names())
+
+def _open(path: str):
+    return sys.stdin if path == "-" else open(path, encoding="utf-8")
+
+def _print_rows(rows: List[Dict], as_json: bool, fmt: str) -> None:
+    if as_json:
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+    for row in rows:
+        print(fmt.format(**row))
+
+def cmd_add(args) -> int:
+    if args.file is None:
+        if args.front is None or args.back is None:
+            raise CliError("add butuh --front dan --back, atau --file")
+        create_deck(args.deck)
+        add_card(args.front, args.back, args.deck)
+        print(1)
+        return 0
+    #banyak kartu: semua ditambahkan ke Deck lalu ditulis sekali
+    create_deck(args.deck)
+    deck = open_deck(args.deck)
+    added = 0
+    with _open(args.file) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            front, sep, back = line.partition("\t")
+            if not sep:
+                raise CliError(f"{args.file}:{lineno}: format harus depan<TAB>belakang")
+            deck.update(Card.new(front=front, back=back).to_dict())
+            added += 1
+    deck.save()
+    print(added)
+    return 0
+
+def cmd_import(args) -> int:
+    path = Path(args.path)
+    name = args.name or path.stem.replace("_", " ")
+    if name in _deck_names() and not args.force:
+        raise CliError(f"Deck '{name}' sudah ada (pakai --force untuk mengganti)")
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        cards = [Card.from_dict(c).to_dict() for c in data["cards"]]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise CliError(f"Gagal membaca/parse JSON: {e}")
+    create_deck(name)
+    save_deck(name, cards)
+    #sama dengan import di menu: progres kartu dimulai dari awal
+    if not args.keep_progress:
+        reset_due(name)
+    print(f"{name}: {len(cards)} kartu")
+    return 0
+
+def cmd_export(args) -> int:
+    _require_deck(args.deck)
+    deck_data = {"cards": load_deck(args.deck)}
+    if args.path == "-":
+        json.dump(deck_data, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    with open(args.path, "w", encoding="utf-8") as f:
+        json.dump(deck_data, f, indent=2, ensure_ascii=False)
+    return 0
+
+#jumlah kartu per kategori dari metadata deck, jatuh tempo dari statistik deck (utils.stats)
+def deck_stats(name: str, now: Optional[int] = None) -> Dict:
+    meta = deck_meta(name)
+    summary = deck_summary(name, now)
+    return {"deck": name, "total": meta["cards"], "new": meta["new"], "learning": meta["learning"],
+            "review": meta["review"], "due_now": summary["due"], "next_due": summary["next_review"]}
+
+def cmd_stats(args) -> int:
+    now = _now_ts()
+    rows = [deck_stats(name, now) for name in _select_decks(args.decks)]
+    _print_rows(rows, args.json, "{deck}: total {total}, baru {new}, tinjau {learning}, "
+                                 "review {review}, jatuh tempo {due_now}")
+    return 0
+
+#isi sesi review hari ini sesuai limit deck
+def cmd_due(args) -> int:
+    rows = []
+    for name in _select_decks(args.decks):
+        limit = load_limit(name)
+        new, learning, due = ReviewSession.for_deck(name, limit["new_limit"], limit["due_limit"]).status()
+        rows.append({"deck": name, "new": new, "learning": learning, "due": due})
+    _print_rows(rows, args.json, "{deck}: baru {new}, tinjau {learning}, jatuh tempo {due}")
+    return 0
+
+def cmd_reset(args) -> int:
+    _require_deck(args.deck)
+    reset_due(args.deck)
+    return 0
+
+#rating dibaca dari stream (1-4 seperti tombol di menu review), diterapkan sesuai urutan sesi
+def cmd_review(args) -> int:
+    if not args.stdin:
+        raise CliError("review tanpa tampilan hanya mendukung --stdin; review interaktif ada di menu utama")
+    _require_deck(args.deck)
+    limit = load_limit(args.deck)
+    new, due = limit["new_limit"], limit["due_limit"]
+    session = ReviewSession.for_deck(args.deck, new, due)
+    index = due_index(args.deck)
+    writer = WriteBehind("batched")
+    reviewed = 0
+    try:
+        for lineno, line in enumerate(sys.stdin, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if not session:
+                break
+            if line not in ("1", "2", "3", "4"):
+                raise CliError(f"baris {lineno}: rating harus 1-4, bukan {line!r}")
+            card = session.pop()
+            if card.first_time and new:
+                new -= 1
+            elif card.step >= 4 and card.due <= _now_ts() and due:
+                due -= 1
+            kind, prev_interval = _status_kind(card), card.interval
+            session.reschedule(card, int(line) - 1, index)
+            writer.save_card(args.deck, card.to_dict())
+            writer.log_review(args.deck, card.id, kind, int(line) - 1, prev_interval, card.interval)
+            reviewed += 1
+            print(json.dumps({"id": card.id, "front": card.front, "rating": int(line),
+                              "due": card.due, "interval": card.interval}, ensure_ascii=False))
+        if reviewed:
+            writer.save_limit(args.deck, new, due, limit["init"])
+    finally:
+        writer.flush()
+        checkpoint(args.deck)
+    print(f"{reviewed} kartu direview, sisa {len(session)} di sesi", file=sys.stderr)
+    return 0
+
+#retensi dari log rating: ringkasan per deck, atau per hari/interval untuk deck yang dipilih
+def cmd_retention(args) -> int:
+    import utils.analytics as analytics
+    names = _select_decks(args.decks)
+    if args.by == "deck":
+        rows = analytics.retention_by_deck(names)
+        for row in rows:
+            row["retention_pct"] = "-" if row["retention"] is None else f"{row['retention']:.1%}"
+        _print_rows(rows, args.json, "{deck}: {ratings} rating, review {reviews}, lapse {lapses}, "
+                                     "retensi {retention_pct}")
+        return 0
+    rows = []
+    for name in names:
+        log = analytics.load_log(name)
+        if args.by == "day":
+            group = analytics.retention_by_day(log)
+            for row in group:
+                row["key"] = time.strftime("%Y-%m-%d", time.gmtime(row["day"] * analytics.DAY))
+        else:
+            group = analytics.retention_by_interval(log)
+            for row in group:
+                row["key"] = row["interval"]
+        rows += [dict(row, deck=name) for row in group]
+    _print_rows(rows, args.json, "{deck} {key}: review {reviews}, lulus {passed}, retensi {retention:.1%}")
+    return 0
+
+#perkiraan review per hari, dijumlahkan untuk deck yang dipilih
+def cmd_forecast(args) -> int:
+    if args.days < 1 or args.runs < 0:
+        raise CliError("--days minimal 1 dan --runs tidak boleh negatif")
+    now = _now_ts()
+    total = [0] * args.days
+    for name in _select_decks(args.decks):
+        for day, count in enumerate(forecast(name, args.days, args.runs, seed=args.seed, now=now)):
+            total[day] += count
+    today = now // 86400
+    rows = [{"date": time.strftime("%Y-%m-%d", time.gmtime((today + day) * 86400)),
+             "reviews": round(count, 1)} for day, count in enumerate(total)]
+    _print_rows(rows, args.json, "{date}: {reviews}")
+    return 0
+
+#fit parameter scheduler per deck dari log rating
+def cmd_optimize(args) -> int:
+    try:
+        from utils.optimizer import fit_deck
+    except ImportError:
+        raise CliError("optimize membutuhkan numpy (pip install numpy)")
+    rows = []
+    for name in _select_decks(args.decks):
+        result = fit_deck(name, write=not args.dry_run, generations=args.generations,
+                          population=args.population, workers=args.workers, seed=args.seed)
+        result["params"] = result["params"].to_dict()
+        for key in ("loss_before", "loss_after"):
+            result[key + "_text"] = "-" if result[key] is None else f"{result[key]:.4f}"
+        rows.append(result)
+    _print_rows(rows, args.json, "{deck}: {reviews} review, loss {loss_before_text} -> {loss_after_text}, "
+                                 "disimpan {saved}, {params}")
+    return 0
+
+#import yang terjadi sebelum frame pertama menu interaktif
+STARTUP_IMPORT = "import sys; sys.path.insert(0, {path!r}); import ui"
+STARTUP_BUDGET_MS = 150
+
+#baris "-X importtime": (self us, cumulative us, nama modul dengan indentasi kedalaman)
+def _parse_importtime(stderr: str) -> List[tuple]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()[1:]))
+    return rows
+
+#cold start diukur di proses baru agar modul belum ada di cache
+def profile_startup(budget_ms: float = STARTUP_BUDGET_MS, top: int = 15) -> int:
+    root = Path(__file__).resolve().parent.parent
+    code = STARTUP_IMPORT.format(path=str(root / "user-interface"))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root,
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise CliError(f"import ui gagal:\n{proc.stderr.strip().splitlines()[-1]}")
+    rows = _parse_importtime(proc.stderr)
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    print(f"{'kumulatif ms':>12} {'sendiri ms':>10}  modul")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:12.1f} {self_us / 1000:10.1f}  {name}")
+    print(f"\n{len(rows)} modul, total import {total_ms:.1f} ms, proses {wall_ms:.1f} ms "
+          f"(budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        print(f"MemoRA: import saat start melebihi budget {budget_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="MemoRA", description="Perintah MemoRA tanpa tampilan interaktif")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="rincian waktu import menu interaktif (python -X importtime)")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="batas waktu import saat start; exit code 1 bila terlewati")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("add", help="tambah kartu ke deck (deck dibuat bila belum ada)")
+    p.add_argument("deck")
+    p.add_argument("--front")
+    p.add_argument("--back")
+    p.add_argument("--file", help="file TSV depan<TAB>belakang, '-' untuk stdin")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("import", help="import deck dari file json")
+    p.add_argument("path")
+    p.add_argument("--name", help="nama deck (default: nama file)")
+    p.add_argument("--force", action="store_true", help="ganti deck yang sudah ada")
+    p.add_argument("--keep-progress", action="store_true", help="jangan reset jadwal kartu")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="ekspor deck ke file json")
+    p.add_argument("deck")
+    p.add_argument("path", help="file tujuan, '-' untuk stdout")
+    p.set_defaults(func=cmd_export)
+
+    for name, func, text in (("stats", cmd_stats, "jumlah kartu per kategori"),
+                             ("due", cmd_due, "isi sesi review hari ini sesuai limit")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("decks", nargs="*", help="default: semua deck")
+        p.add_argument("--json", action="store_true")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("reset", help="reset jadwal semua kartu deck")
+    p.add_argument("deck")
+    p.set_defaults(func=cmd_reset)
+
+    p = sub.add_parser("retention", help="retensi dari log rating")
+    p.add_argument("decks", nargs="*", help="default: semua deck")
+    p.add_argument("--by", choices=("deck", "day", "interval"), default="deck")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_retention)
+
+    p = sub.add_parser("forecast", help="perkiraan jumlah review per hari")
+    p.add_argument("decks", nargs="*", help="default: semua deck")
+    p.add_argument("--days", type=int, default=30)
+    p.add_argument("--runs", type=int, default=0, help="jumlah simulasi Monte Carlo (0 = hanya due sekarang)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("optimize", help="fit parameter scheduler per deck dari log rating (butuh numpy)")
+    p.add_argument("decks", nargs="*", help="default: semua deck")
+    p.add_argument("--generations", type=int, default=12)
+    p.add_argument("--population", type=int, default=16, help="kandidat per generasi")
+    p.add_argument("--workers", type=int, help="jumlah proses (default: jumlah CPU)")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--dry-run", action="store_true", help="jangan simpan parameter ke deck")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_optimize)
+
+    p = sub.add_parser("review", help="review dengan rating dari stdin")
+    p.add_argument("deck")
+    p.add_argument("--stdin", action="store_true", help="baca rating 1-4 per baris dari stdin")
+    p.set_defaults(func=cmd_review)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None and not args.profile_startup:
+        parser.error("butuh perintah atau --profile-startup")
+    try:
+        if args.profile_startup:
+            return profile_startup(args.budget_ms)
+        return args.func(args)
+    except CliError as e:
+        print(f"MemoRA: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,51 @@
+"""Sumber waktu MemoRA (detik epoch UTC).
+
+Semua jadwal kartu dan limit membaca waktu lewat now(), sehingga jam bisa diganti,
+mis. ManualClock untuk simulasi berbulan-bulan review dalam hitungan detik.
+"""
+import time
+from contextlib import contextmanager
+
+class SystemClock:
+    """Jam dinding sistem."""
+
+    def now(self) -> int:
+        return int(time.time())
+
+class ManualClock:
+    """Jam yang hanya bergerak lewat advance()/set()."""
+
+    def __init__(self, start: int):
+        self.ts = int(start)
+
+    def now(self) -> int:
+        return self.ts
+
+    def advance(self, seconds: float) -> int:
+        self.ts += int(seconds)
+        return self.ts
+
+    def set(self, ts: int) -> None:
+        self.ts = int(ts)
+
+_clock = SystemClock()
+
+def now() -> int:
+    return _clock.now()
+
+def get_clock():
+    return _clock
+
+#mengganti jam global, mengembalikan jam sebelumnya
+def set_clock(clock):
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+@contextmanager
+def use_clock(clock):
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+#DATA_DIR dibaca saat utils.deck di-import: arahkan ke folder sementara sebelum test meng-import modul
+os.environ.setdefault("MEMORA_DATA_DIR", tempfile.mkdtemp(prefix="memora-test-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -1,44 +1,505 @@
 import json
+import atexit
+import functools
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List
-from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
 import os
+from utils import clock
 
-#path folder untuk menyimpan json
-DATA_DIR = Path(__file__).parent / "data"
+#path folder untuk menyimpan json (bisa diganti lewat MEMORA_DATA_DIR, mis. untuk benchmark)
+DATA_DIR = Path(os.environ.get("MEMORA_DATA_DIR", Path(__file__).parent / "data"))
 #jika folder tidak ada maka dibuat
 DATA_DIR.mkdir(exist_ok=True)
 
 #path untuk file index
 INDEX_FILE = DATA_DIR / "decks_index.json"
 
+#backend penyimpanan kartu: "json" (default, satu file per deck) atau "sqlite"
+STORAGE_BACKEND = os.environ.get("MEMORA_STORAGE", "json").lower()
+DB_FILE = DATA_DIR / "memora.db"
+_store = None
+
+#semua akses cache/file deck lewat satu lock agar aman dipakai thread penulis (utils.writer)
+_lock = threading.RLock()
+
+def _locked(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+def _use_sqlite() -> bool:
+    return STORAGE_BACKEND == "sqlite"
+
+#koneksi DeckStore dibuat sekali saat pertama dipakai
+def _sqlite():
+    global _store
+    if _store is None:
+        from utils.sqlite_store import DeckStore
+        _store = DeckStore(DB_FILE)
+    return _store
+
+#jumlah entri journal sebelum snapshot json ditulis ulang
+JOURNAL_CHECKPOINT = 200
+#field kartu yang bisa dicatat di journal (hanya yang berubah yang ditulis)
+JOURNAL_FIELDS = ("front", "back", "interval", "ease_factor", "step", "due", "first_time")
+#jumlah entri journal per deck yang belum di-checkpoint (dalam proses ini)
+_journal_counts: Dict[str, int] = {}
+
+#batas memori cache deck (perkiraan memori kartu, lihat _cache_cost), bisa diubah lewat set_cache_budget
+CACHE_BUDGET = int(os.environ.get("MEMORA_CACHE_MB", "64")) * 1024 * 1024
+#cache deck json yang sudah di-parse, urutan = LRU (paling lama dipakai di depan)
+_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+#callback (nama deck, dict kartu lama atau None, dict kartu) yang dipanggil setiap save_card
+_save_listeners: List[Callable[[str, Optional[Dict], Dict], None]] = []
+
+DAY = 86400
+#index (decks + meta) yang sudah di-parse, divalidasi dengan mtime/size file index
+_index_cache: Optional[Tuple[Tuple, Dict]] = None
+#metadata per deck yang sedang dipakai proses ini; yang belum ditulis ke index ada di _meta_dirty
+_meta: Dict[str, Dict] = {}
+_meta_dirty = set()
+
+#waktu disimpan sebagai detik epoch (int); string ISO dari file lama dibaca otomatis
+def to_epoch(value) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def _now_ts() -> int:
+    return clock.now()
+
+#mengubah field waktu format lama (ISO) di kartu/limit menjadi epoch
+def _normalize_times(data: Dict) -> None:
+    for card in data.get("cards", []):
+        if "due" in card and not isinstance(card["due"], int):
+            card["due"] = to_epoch(card["due"])
+    limit = data.get("limit")
+    if limit is not None and "date" in limit and not isinstance(limit["date"], int):
+        limit["date"] = to_epoch(limit["date"])
+
+def _default_limit() -> Dict:
+    return {"new_limit": 20, "due_limit":100, "init": [20, 100],"date":_now_ts()}
+
 #mengecek jika index ada, jika tidak membuat file index berupa json
 def _ensure_index():
     if not INDEX_FILE.exists():
         INDEX_FILE.write_text(json.dumps({"decks": []}, indent=2))
 
-#membaca index menjadi dict dari file json
+def _index_stat() -> Tuple:
+    st = os.stat(INDEX_FILE)
+    return (st.st_mtime_ns, st.st_size)
+
+#membaca index menjadi dict dari file json (file hanya di-parse ulang bila berubah)
+@_locked
 def load_index() -> Dict[str,List[str]]:
+    global _index_cache
     _ensure_index()
-    with INDEX_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    stat = _index_stat()
+    if _index_cache is None or _index_cache[0] != stat:
+        with INDEX_FILE.open("r", encoding="utf-8") as f:
+            _index_cache = (stat, json.load(f))
+    index = _index_cache[1]
+    #salinan dangkal: pemanggil boleh mengubah list decks lalu save_index
+    return dict(index, decks=list(index.get("decks", [])), meta=dict(index.get("meta", {})))
 
-#menyimpan perubahan pada index
+#menyimpan perubahan pada index; metadata deck yang berubah di proses ini ikut ditulis
+@_locked
 def save_index(index: Dict[str, List[str]]) -> None:
-    with INDEX_FILE.open("w", encoding="utf-8") as f:
+    global _index_cache
+    decks = index.get("decks", [])
+    meta = {name: m for name, m in index.get("meta", {}).items() if name in decks}
+    if not _use_sqlite():
+        for name in decks:
+            if name in _meta:
+                meta[name] = _meta[name]
+        _meta_dirty.clear()
+    index = dict(index, meta=meta)
+    #ditulis atomik seperti snapshot deck: file index yang terpotong membuat semua deck hilang dari menu
+    tmp = INDEX_FILE.with_suffix(".json.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
         json.dump(index, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, INDEX_FILE)
+    _fsync_dir(INDEX_FILE.parent)
+    _index_cache = (_index_stat(), index)
 
 #membuat path
 def deck_file_path(name: str) -> Path:
     safe = "".join(c if c.isalnum()else "_" for c in name)
     return DATA_DIR / f"{safe}.json"
 
+class Deck:
+    """Kartu satu deck dalam CardTable kolumnar (utils.cards) dengan index id -> posisi.
+
+    get/update/delete per id dalam O(1) (delete O(n)); dict kartu dibuat saat diminta.
+    """
+
+    def __init__(self, name: str, cards: Iterable[Dict]):
+        #import di sini: utils.cards meng-import modul ini
+        from utils.cards import CardTable
+        self.name = name
+        self.table = CardTable(cards)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self.table
+
+    def __iter__(self):
+        return self.table.rows()
+
+    #list dict kartu sesuai urutan penambahan
+    def cards(self) -> List[Dict]:
+        return self.table.to_dicts()
+
+    def get(self, card_id: str) -> Optional[Dict]:
+        pos = self.table.position(card_id)
+        return None if pos is None else self.table.row(pos)
+
+    #mengganti kartu dengan id yang sama, atau menambah di akhir bila belum ada
+    def update(self, card: Dict) -> None:
+        self.table.set(card)
+
+    def delete(self, card_id: str) -> bool:
+        return self.table.delete(card_id)
+
+    def save(self) -> None:
+        save_deck(self.name, self.cards())
+
+#membuka deck sebagai objek Deck
+def open_deck(name: str) -> Deck:
+    return Deck(name, load_deck(name))
+
+#path journal append-only milik deck
+def journal_file_path(name: str) -> Path:
+    return deck_file_path(name).with_suffix(".journal")
+
+#log rating (lihat utils.reviewlog), dipakai oleh kedua backend
+def review_log_path(name: str) -> Path:
+    return deck_file_path(name).with_suffix(".reviews")
+
 #mengecek jika file deck ada, jika tidak membuat file deck json
 def _ensure_deck_file(name: str) -> None:
     path = deck_file_path(name)
     if not path.exists():
         path.write_text(json.dumps({"cards": []}, indent=2))
-    
+
+#mtime/size snapshot dan journal, dipakai untuk validasi cache
+def _deck_stat(name: str) -> Tuple:
+    stats = []
+    for path in (deck_file_path(name), journal_file_path(name)):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            stats.append(None)
+        else:
+            stats.append((st.st_mtime_ns, st.st_size))
+    return tuple(stats)
+
+#revisi file deck (snapshot + journal) dalam bentuk yang sama setelah disimpan ke json
+def _rev(name: str) -> List:
+    return [list(s) if s is not None else None for s in _deck_stat(name)]
+
+#kategori kartu untuk metadata: 0 = baru, 1 = tinjau (learning), 2 = review (sama dengan status sesi)
+def _meta_kind(card: Dict) -> int:
+    if card.get("first_time", True):
+        return 0
+    return 1 if card.get("step", 1) < 4 else 2
+
+def _meta_next_due(meta: Dict) -> Optional[int]:
+    candidates = [] if meta["learning_due"] is None else [meta["learning_due"]]
+    if meta["due_days"]:
+        #review hanya tercatat per hari, jadi awal harinya dipakai (tidak pernah lebih lambat)
+        candidates.append(min(int(day) for day in meta["due_days"]) * DAY)
+    return min(candidates) if candidates else None
+
+#menambah (sign=1) atau mengurangi (sign=-1) satu kartu dari metadata
+def _meta_add(meta: Dict, card: Dict, sign: int) -> None:
+    kind = _meta_kind(card)
+    meta["cards"] += sign
+    meta[("new", "learning", "review")[kind]] += sign
+    if kind == 0 and sign > 0:
+        #due kartu baru paling awal; tidak dinaikkan saat kartu keluar, jadi tetap batas bawah
+        due = to_epoch(card["due"])
+        if meta.get("new_due") is None or due < meta["new_due"]:
+            meta["new_due"] = due
+    elif kind == 1:
+        #due learning paling awal, batas bawah seperti new_due (ukuran index tidak tumbuh per kartu);
+        #dikosongkan saat kartu learning habis
+        if sign > 0:
+            due = to_epoch(card["due"])
+            if meta["learning_due"] is None or due < meta["learning_due"]:
+                meta["learning_due"] = due
+        elif meta["learning"] == 0:
+            meta["learning_due"] = None
+    elif kind == 2:
+        day = str(to_epoch(card["due"]) // DAY)
+        count = meta["due_days"].get(day, 0) + sign
+        if count > 0:
+            meta["due_days"][day] = count
+        else:
+            meta["due_days"].pop(day, None)
+
+#metadata dihitung penuh dari daftar kartu (sekali, saat belum ada atau sudah basi)
+def _build_meta(cards: Iterable[Dict], limit: Optional[Dict] = None) -> Dict:
+    meta = {"cards": 0, "new": 0, "learning": 0, "review": 0, "learning_due": None, "due_days": {},
+            "new_due": None, "limit": limit}
+    for card in cards:
+        _meta_add(meta, card, 1)
+    meta["next_due"] = _meta_next_due(meta)
+    return meta
+
+#metadata deck: jumlah kartu per kategori, due learning paling awal, jumlah review per hari (UTC),
+#next_due, new_due, limit, dan rev file deck; dibaca dari index tanpa membuka file deck selama rev sama
+@_locked
+def deck_meta(name: str) -> Dict:
+    if _use_sqlite():
+        if name not in _meta:
+            _meta[name] = _sqlite().deck_meta(name)
+            _meta[name]["next_due"] = _meta_next_due(_meta[name])
+            _meta[name]["limit"] = _sqlite().load_limit(name)
+        return _meta[name]
+    rev = _rev(name)
+    meta = _meta.get(name)
+    if meta is None or meta.get("rev") != rev:
+        meta = load_index()["meta"].get(name)
+        #index lama menyimpan learning_due per kartu: dihitung ulang
+        if meta is not None and isinstance(meta.get("learning_due"), dict):
+            meta = None
+        if meta is not None:
+            #salinan, karena metadata di memori diubah per kartu
+            meta = dict(meta, due_days=dict(meta["due_days"]))
+    if meta is None or meta.get("rev") != rev:
+        data = _read_deck_data(name)
+        meta = _build_meta(_cache[name]["deck"], data.get("limit"))
+        meta["rev"] = rev
+        _meta_dirty.add(name)
+    _meta[name] = meta
+    return meta
+
+#jumlah review yang jatuh tempo sampai akhir hari ini (UTC) menurut metadata
+def meta_due_count(meta: Dict, now: Optional[int] = None) -> int:
+    today = (_now_ts() if now is None else now) // DAY
+    return sum(count for day, count in meta["due_days"].items() if int(day) <= today)
+
+#satu kartu berubah: metadata diperbarui tanpa menghitung ulang deck
+def _meta_update(name: str, old: Optional[Dict], card: Dict) -> None:
+    meta = _meta.get(name)
+    if meta is None:
+        return
+    if old:
+        _meta_add(meta, old, -1)
+    if card:
+        _meta_add(meta, card, 1)
+    meta["next_due"] = _meta_next_due(meta)
+    meta["rev"] = _rev(name)
+    _meta_dirty.add(name)
+
+#menulis metadata yang berubah ke file index
+@_locked
+def flush_meta() -> None:
+    if _meta_dirty and not _use_sqlite():
+        save_index(load_index())
+
+#menerapkan satu entri journal ke data (limit/params) atau ke kartu di Deck
+def _apply_entry(data: Dict, deck: Deck, entry: Dict) -> None:
+    if "limit" in entry:
+        data["limit"] = entry["limit"]
+        _normalize_times(data)
+        return
+    if "params" in entry:
+        data["params"] = entry["params"]
+        return
+    fields = {f: entry[f] for f in JOURNAL_FIELDS if f in entry}
+    if "due" in fields and not isinstance(fields["due"], int):
+        fields["due"] = to_epoch(fields["due"])
+    old = deck.get(entry.get("id"))
+    if old is not None:
+        deck.update({**old, **fields})
+    elif "front" in fields:
+        #kartu baru dari add_card
+        deck.update({"id": entry["id"], **fields})
+
+#perkiraan byte per kartu untuk struktur turunan di extras (index jatuh tempo + statistik deck);
+#dihitung sejak deck masuk cache karena extras biasanya dibangun sesudahnya
+EXTRAS_CARD_BYTES = 140
+
+#perkiraan memori deck di cache: tabel kartu ditambah extras
+def _cache_cost(deck: Deck) -> int:
+    return deck.table.nbytes() + len(deck) * EXTRAS_CARD_BYTES
+
+#data = isi file json tanpa "cards" (limit, params); kartu hanya ada di Deck
+def _cache_put(name: str, data: Dict, deck: Deck, extras: Optional[Dict] = None) -> None:
+    stat = _deck_stat(name)
+    cost = _cache_cost(deck)
+    _cache[name] = {"data": data, "deck": deck, "stat": stat, "cost": cost,
+                    "extras": {} if extras is None else extras}
+    _cache.move_to_end(name)
+    total = sum(e["cost"] for e in _cache.values())
+    while total > CACHE_BUDGET and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        total -= evicted["cost"]
+        _cache_stats["evictions"] += 1
+
+def _cache_drop(name: str) -> None:
+    _cache.pop(name, None)
+
+#mengatur batas memori cache (byte) dan langsung membuang deck lama bila perlu
+def set_cache_budget(budget: int) -> None:
+    global CACHE_BUDGET
+    CACHE_BUDGET = budget
+    while sum(e["cost"] for e in _cache.values()) > CACHE_BUDGET and len(_cache) > 1:
+        _cache.popitem(last=False)
+        _cache_stats["evictions"] += 1
+
+#counter hit/miss cache deck
+def cache_stats() -> Dict[str, int]:
+    return dict(_cache_stats, size=len(_cache), bytes=sum(e["cost"] for e in _cache.values()))
+
+def clear_cache() -> None:
+    _cache.clear()
+    for key in _cache_stats:
+        _cache_stats[key] = 0
+
+#membaca snapshot json lalu memutar ulang entri journal di atasnya (lewat cache)
+@_locked
+def _read_deck_data(name: str) -> Dict:
+    entry = _cache.get(name)
+    if entry is not None and entry["stat"] == _deck_stat(name):
+        _cache.move_to_end(name)
+        _cache_stats["hits"] += 1
+        return entry["data"]
+    _cache_stats["misses"] += 1
+    _ensure_deck_file(name)
+    with deck_file_path(name).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    _normalize_times(data)
+    #list dict hasil parse langsung dipindah ke kolom lalu dibuang
+    deck = Deck(name, data.pop("cards", []))
+    journal = journal_file_path(name)
+    if journal.exists():
+        with journal.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    _apply_entry(data, deck, json.loads(line))
+                except ValueError:
+                    #baris terakhir bisa terpotong bila program berhenti saat menulis
+                    continue
+    _cache_put(name, data, deck)
+    return data
+
+#fsync folder agar os.replace ikut tersimpan; tidak didukung di windows
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+#menulis snapshot json secara atomik lalu mengosongkan journal; dict kartu hanya dibuat untuk ditulis
+def _write_deck_data(name: str, data: Dict, deck: Deck, extras: Optional[Dict] = None) -> None:
+    path = deck_file_path(name)
+    tmp = path.with_suffix(".json.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(dict(data, cards=deck.cards()), f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    #snapshot baru harus sudah di disk sebelum journal (satu-satunya salinan rating) dihapus
+    _fsync_dir(path.parent)
+    journal = journal_file_path(name)
+    if journal.exists():
+        os.remove(journal)
+    _journal_counts.pop(name, None)
+    _cache_put(name, data, deck, extras)
+
+#jumlah baris utuh di journal; sisa baris terpotong (crash saat menulis) dibuang
+#agar entri berikutnya tidak tersambung ke potongan itu lalu ikut diabaikan saat replay
+def _trim_journal(journal: Path) -> int:
+    if not journal.exists():
+        return 0
+    with journal.open("r+b") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+    return data.count(b"\n", 0, end)
+
+#menambah satu baris ke journal dan fsync, lalu checkpoint bila journal sudah panjang
+@_locked
+def _append_journal(name: str, entry: Dict) -> None:
+    #metadata dimuat sebelum file berubah agar bisa diperbarui per entri
+    deck_meta(name)
+    data = _read_deck_data(name)
+    journal = journal_file_path(name)
+    if name not in _journal_counts:
+        _journal_counts[name] = _trim_journal(journal)
+    with journal.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    _journal_counts[name] += 1
+    #cache ikut diperbarui tanpa membaca ulang file
+    deck = _cache[name]["deck"]
+    old = deck.get(entry.get("id"))
+    _apply_entry(data, deck, entry)
+    _cache_put(name, data, deck, _cache[name]["extras"])
+    if "id" in entry:
+        _meta_update(name, old, deck.get(entry["id"]))
+    elif name in _meta:
+        if "limit" in entry:
+            _meta[name]["limit"] = entry["limit"]
+        _meta[name]["rev"] = _rev(name)
+        _meta_dirty.add(name)
+    if _journal_counts[name] >= JOURNAL_CHECKPOINT:
+        checkpoint(name)
+
+#menggabungkan journal ke snapshot json (akhir sesi, journal penuh, atau saat keluar)
+@_locked
+def checkpoint(name: str) -> None:
+    if _use_sqlite() or not journal_file_path(name).exists():
+        return
+    data = _read_deck_data(name)
+    #isi deck tidak berubah, jadi Deck dan extras di cache tetap dipakai
+    _write_deck_data(name, data, _cache[name]["deck"], _cache[name]["extras"])
+    if name in _meta:
+        _meta[name]["rev"] = _rev(name)
+        _meta_dirty.add(name)
+    flush_meta()
+
+def checkpoint_all() -> None:
+    for name in list(_journal_counts):
+        checkpoint(name)
+    flush_meta()
+
+atexit.register(checkpoint_all)
+
+#membuang journal tanpa digabung, mis. saat file deck ditimpa hasil import
+@_locked
+def discard_journal(name: str) -> None:
+    journal = journal_file_path(name)
+    if journal.exists():
+        os.remove(journal)
+    _journal_counts.pop(name, None)
+    _cache_drop(name)
+    _meta.pop(name, None)
+
 #membuat deck dan memasukkan ke dalam file index
 def create_deck(name: str) -> None:
     _ensure_index()
@@ -47,61 +508,171 @@ def create_deck(name: str) -> None:
     if name not in decks:
         decks.append(name)
         save_index(index)
+    if _use_sqlite():
+        return
     _ensure_deck_file(name)
 
 #membuka deck dari file json menjadi List Dictionary
+#dict dibuat baru dari tabel kolumnar di cache; perubahan disimpan lewat save_card/save_deck
+@_locked
 def load_deck(name: str) -> List[Dict]:
-    _ensure_deck_file(name)
-    with deck_file_path(name).open("r", encoding="utf-8")as f:
-        data = json.load(f)
-    return data.get("cards", [])
+    if _use_sqlite():
+        return _sqlite().load_deck(name)
+    return cached_deck(name).cards()
 
 #membuka limit kartu dari file json
+@_locked
 def load_limit(deck: str):
-    path = deck_file_path(deck)
-    with deck_file_path(deck).open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    if "limit" not in data:
-        data["limit"] = {"new_limit": 20, "due_limit":100, "init": [20, 100],"date":(datetime.now(timezone.utc)).isoformat()}
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    return data.get("limit",{})
+    if _use_sqlite():
+        limit = _sqlite().load_limit(deck)
+        if limit is None:
+            limit = _default_limit()
+            _sqlite().save_limit(deck, limit)
+        return limit
+    limit = _read_deck_data(deck).get("limit")
+    if limit is None:
+        limit = _default_limit()
+        _append_journal(deck, {"limit": limit})
+    return limit
 
 #menyimpan limit kartu
+@_locked
 def save_limit(deck: str, limit_new: int, limit_due: int, init: list, date: int = 1):
-    path = deck_file_path(deck)
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    data["limit"] = {"new_limit": limit_new,"due_limit": limit_due, "init": init, "date": (datetime.now(timezone.utc) + timedelta(days=date)).isoformat()}
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent = 2)
+    limit = {"new_limit": limit_new,"due_limit": limit_due, "init": init, "date": _now_ts() + date * 86400}
+    if _use_sqlite():
+        _sqlite().save_limit(deck, limit)
+        if deck in _meta:
+            _meta[deck]["limit"] = limit
+        return
+    _append_journal(deck, {"limit": limit})
+
+#parameter scheduler hasil optimizer (lihat utils.optimizer), None bila deck memakai default
+@_locked
+def load_params(deck: str) -> Optional[Dict]:
+    if _use_sqlite():
+        return _sqlite().load_params(deck)
+    return _read_deck_data(deck).get("params")
+
+@_locked
+def save_params(deck: str, params: Optional[Dict]) -> None:
+    if _use_sqlite():
+        _sqlite().save_params(deck, params)
+        return
+    _append_journal(deck, {"params": params})
 
 #menyimpan List Dict ke file json
+@_locked
 def save_deck(name: str, cards: List[Dict]) -> None:
-    _ensure_deck_file(name)
-    data = load_deck(name)
-    path = deck_file_path(name)
-    data = {"cards": cards}
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if _use_sqlite():
+        _sqlite().save_deck(name, cards)
+        _meta.pop(name, None)
+        return
+    #key lain (mis. limit) tetap disimpan
+    data = dict(_read_deck_data(name))
+    _write_deck_data(name, data, Deck(name, cards))
+    _meta[name] = dict(_build_meta(cards, data.get("limit")), rev=_rev(name))
+    _meta_dirty.add(name)
+    flush_meta()
+
+#menyimpan satu kartu (edit, rating, atau kartu baru); di sqlite satu baris, di json satu baris journal
+@_locked
+def save_card(name: str, card: Dict) -> None:
+    if _use_sqlite():
+        _sqlite().save_card(name, card)
+        _meta.pop(name, None)
+        return
+    old = cached_deck(name).get(card["id"])
+    #hanya field yang berubah yang ditulis, rating tidak menyalin front/back
+    entry = {"id": card["id"]}
+    entry.update((field, card[field]) for field in JOURNAL_FIELDS
+                 if field in card and (old or {}).get(field) != card[field])
+    entry["ts"] = _now_ts()
+    _append_journal(name, entry)
+    for listener in _save_listeners:
+        listener(name, old, card)
+
+#Deck milik cache (jangan diubah langsung), dipakai untuk lookup O(1) di jalur json
+@_locked
+def cached_deck(name: str) -> Deck:
+    _read_deck_data(name)
+    return _cache[name]["deck"]
+
+#tempat struktur turunan (mis. index jatuh tempo) yang hidup selama isi deck di cache sama;
+#dibuang saat deck dibaca ulang dari disk atau ditulis ulang lewat save_deck
+@_locked
+def deck_extras(name: str) -> Optional[Dict]:
+    if _use_sqlite():
+        return None
+    _read_deck_data(name)
+    return _cache[name]["extras"]
+
+def add_save_listener(listener: Callable[[str, Optional[Dict], Dict], None]) -> None:
+    _save_listeners.append(listener)
+
+#kartu kandidat sesi review; di sqlite hanya kartu baru/learning/jatuh tempo yang dibaca
+@_locked
+def load_queue_cards(name: str, now_ts: int) -> List[Dict]:
+    if _use_sqlite():
+        return _sqlite().load_queue_cards(name, now_ts)
+    return load_deck(name)
 
 #menghapus file json deck dan index deck dari file index
+@_locked
 def delete_deck(name: str) -> None:
-    _ensure_deck_file(name)
     list_deck = load_index()
-    os.remove(deck_file_path(name))
+    if _use_sqlite():
+        _sqlite().delete_deck(name)
+    else:
+        _ensure_deck_file(name)
+        os.remove(deck_file_path(name))
+        discard_journal(name)
+        _cache_drop(name)
+    if review_log_path(name).exists():
+        os.remove(review_log_path(name))
     if name in list_deck["decks"]:
         list_deck["decks"].remove(name)
+    _meta.pop(name, None)
     save_index(list_deck)
 
 #mengganti nama deck dan menyimpan ke index
+@_locked
 def rename_deck(old_name: str, new_name: str) -> None:
-    _ensure_deck_file(old_name)
+    meta = None if _use_sqlite() else deck_meta(old_name)
     list_decks = load_index()
-    old = deck_file_path(old_name)
-    new = deck_file_path(new_name)
     if old_name in list_decks["decks"]:
         index = list_decks["decks"].index(old_name)
         list_decks["decks"][index] = new_name
-    os.rename(old, new)
-    save_index(list_decks)
\ No newline at end of file
+    if _use_sqlite():
+        _sqlite().rename_deck(old_name, new_name)
+    else:
+        _ensure_deck_file(old_name)
+        checkpoint(old_name)
+        os.rename(deck_file_path(old_name), deck_file_path(new_name))
+        _cache_drop(old_name)
+    if review_log_path(old_name).exists():
+        os.replace(review_log_path(old_name), review_log_path(new_name))
+    #isi deck sama, hanya nama (dan rev file) yang berubah
+    _meta.pop(old_name, None)
+    if meta is not None:
+        _meta[new_name] = dict(meta, rev=_rev(new_name))
+    save_index(list_decks)
+
+#migrasi sekali jalan dari file json ke sqlite, mengembalikan jumlah kartu yang dipindah
+def migrate_to_sqlite(names: List[str] = None) -> int:
+    store = _sqlite()
+    if names is None:
+        names = load_index().get("decks", [])
+    total = 0
+    for name in names:
+        if not deck_file_path(name).exists():
+            continue
+        data = _read_deck_data(name)
+        cards = cached_deck(name).cards()
+        store.save_deck(name, cards)
+        _meta.pop(name, None)
+        if "limit" in data:
+            store.save_limit(name, data["limit"])
+        if data.get("params") is not None:
+            store.save_params(name, data["params"])
+        total += len(cards)
+    return total
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Fit SchedulerParams per deck dari log rating (utils.reviewlog).
+
+Riwayat setiap kartu diputar ulang dengan parameter kandidat, persis seperti update_schedule,
+semua kartu sekaligus per urutan review (numpy). Jeda yang dijadwalkan parameter kandidat
+memprediksi peluang ingat saat review berikutnya: p = TARGET_RETENTION ** (jeda nyata / jeda jadwal).
+Loss adalah log loss p terhadap hasil nyata (lulus bila rating bukan Again). Kandidat dievaluasi
+paralel di ProcessPoolExecutor; parameter terbaik ditulis ke deck dengan save_params.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.analytics import load_log
+from utils.cards import SchedulerParams, DEFAULT_PARAMS, DAY, deck_params
+from utils.deck import save_params
+
+TARGET_RETENTION = 0.9
+#minimal jumlah review yang bisa diprediksi agar deck di-fit
+MIN_REVIEWS = 100
+#batas (bawah, atas): hard_ease, easy_ease, hard_factor, easy_bonus, step 1-3 (detik)
+BOUNDS = np.array([(0.0, 0.5), (0.0, 0.5), (1.0, 2.0), (1.0, 2.5),
+                   (10, 600), (60, 3600), (120, 14400)], dtype=np.float64)
+
+def params_vector(params: SchedulerParams) -> np.ndarray:
+    return np.array([params.hard_ease, params.easy_ease, params.hard_factor, params.easy_bonus,
+                     *params.steps], dtype=np.float64)
+
+def vector_params(vector: Sequence[float]) -> SchedulerParams:
+    steps = tuple(sorted(int(round(s)) for s in vector[4:7]))
+    return SchedulerParams(*(round(float(v), 4) for v in vector[:4]), steps=steps)
+
+@dataclass
+class Replay:
+    """Log rating satu deck yang sudah dikelompokkan per urutan review kartu."""
+    cards: int
+    #state awal per kartu: interval, step
+    interval: np.ndarray
+    step: np.ndarray
+    #per urutan review ke-k: index kartu, rating, jeda nyata sejak review sebelumnya (detik)
+    groups: List[tuple]
+    predictions: int
+
+    @classmethod
+    def from_log(cls, log) -> "Replay":
+        _, card = np.unique(log["card"], return_inverse=True)
+        card = card.ravel()
+        order = np.lexsort((log["ts"], card))
+        card, ts = card[order], log["ts"][order]
+        quality, kind = log["quality"][order].astype(np.int64), log["kind"][order]
+        first = np.ones(len(card), dtype=bool)
+        first[1:] = card[1:] != card[:-1]
+        starts = np.flatnonzero(first)
+        pos = np.arange(len(card)) - np.repeat(starts, np.diff(np.append(starts, len(card))))
+        elapsed = np.zeros(len(card), dtype=np.float64)
+        elapsed[1:] = ts[1:] - ts[:-1]
+        cards = len(starts)
+        interval = np.maximum(log["prev"][order][starts], 1.0)
+        #status awal dari record pertama: review (step 4), selain itu learning step 1
+        step = np.where(kind[starts] == 2, 4, 1)
+        by_pos = np.argsort(pos, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(pos))))
+        groups = []
+        for k in range(len(bounds) - 1):
+            sel = by_pos[bounds[k]:bounds[k + 1]]
+            groups.append((card[sel], quality[sel], np.maximum(elapsed[sel], 1.0)))
+        return cls(cards, interval, step, groups, len(card) - cards)
+
+    #log loss rata-rata untuk satu vektor parameter
+    def loss(self, vector: Sequence[float]) -> float:
+        hard_ease, easy_ease, hard_factor, easy_bonus = vector[:4]
+        steps = np.sort(np.asarray(vector[4:7], dtype=np.float64))
+        interval = self.interval.copy()
+        ease = np.full(self.cards, 2.5)
+        step = self.step.copy()
+        gap = np.ones(self.cards)
+        total = 0.0
+        for k, (c, q, elapsed) in enumerate(self.groups):
+            if k:
+                p = np.clip(TARGET_RETENTION ** (elapsed / gap[c]), 1e-6, 1 - 1e-6)
+                total -= np.where(q > 0, np.log(p), np.log1p(-p)).sum()
+            i, e, s = interval[c], ease[c], step[c]
+            #sama dengan update_schedule/learning_steps
+            learning = ((q == 0) | (s < 3)) & (q < 3)
+            s_learn = np.where(s < 3, np.where(q == 0, 1, s + q), s)
+            i_learn = np.where(s < 3, 1.0, i)
+            e_next = e + np.where(q == 1, -hard_ease, 0.0) + np.where(q == 3, easy_ease, 0.0)
+            i_review = np.round(i * np.select([q == 1, q == 2], [hard_factor, e_next], e_next * easy_bonus))
+            gap[c] = np.where(learning, steps[np.minimum(s_learn, 3) - 1], i * DAY)
+            interval[c] = np.where(learning, i_learn, i_review)
+            ease[c] = np.where(learning, e, np.maximum(1.3, e_next))
+            step[c] = np.where(learning, s_learn, 4)
+        return float(total / max(self.predictions, 1))
+
+#data replay disimpan sekali per proses worker
+_replay: Optional[Replay] = None
+
+def _init_worker(replay: Replay) -> None:
+    global _replay
+    _replay = replay
+
+def _evaluate(vector: np.ndarray) -> float:
+    return _replay.loss(vector)
+
+#pencarian acak di sekitar parameter terbaik, langkah mengecil bila tidak ada perbaikan
+def fit_replay(replay: Replay, start: SchedulerParams = DEFAULT_PARAMS, generations: int = 12,
+               population: int = 16, workers: Optional[int] = None, seed: Optional[int] = None) -> Dict:
+    rng = np.random.default_rng(seed)
+    low, high = BOUNDS[:, 0], BOUNDS[:, 1]
+    best = np.clip(params_vector(start), low, high)
+    best_loss = initial = replay.loss(best)
+    sigma = 0.25
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(replay,)) as pool:
+        for _ in range(generations):
+            candidates = np.clip(best + rng.normal(0, sigma, (population, len(best))) * (high - low), low, high)
+            losses = list(pool.map(_evaluate, candidates, chunksize=max(1, population // 8)))
+            i = int(np.argmin(losses))
+            if losses[i] < best_loss:
+                best, best_loss = candidates[i], losses[i]
+            else:
+                sigma /= 2
+    return {"reviews": replay.predictions, "loss_before": float(initial), "loss_after": float(best_loss),
+            "params": vector_params(best)}
+
+#fit satu deck; parameter ditulis ke deck kecuali write=False atau review terlalu sedikit
+def fit_deck(deck_name: str, write: bool = True, **options) -> Dict:
+    log = load_log(deck_name)
+    start = deck_params(deck_name)
+    if len(log) == 0:
+        return {"deck": deck_name, "reviews": 0, "loss_before": None, "loss_after": None,
+                "params": start, "saved": False}
+    replay = Replay.from_log(log)
+    if replay.predictions < MIN_REVIEWS:
+        return {"deck": deck_name, "reviews": replay.predictions, "loss_before": None, "loss_after": None,
+                "params": start, "saved": False}
+    result = fit_replay(replay, start, **options)
+    saved = write and result["loss_after"] < result["loss_before"]
+    if saved:
+        save_params(deck_name, result["params"].to_dict())
+    return dict(result, deck=deck_name, saved=saved)
@@ -0,0 +1,69 @@
+import struct
+import uuid
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+from utils import clock
+from utils.deck import review_log_path
+
+#satu record per rating (little endian, tanpa padding, 46 byte):
+#  card   16s  uuid kartu (id lain di-hash, lihat card_key)
+#  ts     q    waktu rating, detik epoch
+#  kind   B    status kartu sebelum rating: 0 baru, 1 tinjau (learning), 2 review
+#  quality B   rating 0-3 (tombol 1-4)
+#  prev   d    interval sebelum rating (hari)
+#  next   d    interval sesudah rating (hari)
+#  latency I   waktu menjawab sejak pertanyaan tampil, milidetik (0 = tidak diukur)
+RECORD = struct.Struct("<16sqBBddI")
+FIELDS = ("card", "ts", "kind", "quality", "prev", "next", "latency")
+
+#id kartu menjadi 16 byte: uuid langsung, id lain lewat uuid5 agar tetap konsisten
+def card_key(card_id: str) -> bytes:
+    try:
+        return uuid.UUID(card_id).bytes
+    except (ValueError, AttributeError, TypeError):
+        return uuid.uuid5(uuid.NAMESPACE_OID, str(card_id)).bytes
+
+def pack_review(card_id: str, kind: int, quality: int, prev_interval: float, next_interval: float,
+                latency_ms: int = 0, ts: Optional[int] = None) -> bytes:
+    ts = clock.now() if ts is None else ts
+    return RECORD.pack(card_key(card_id), ts, kind, quality, prev_interval, next_interval,
+                       max(0, min(int(latency_ms), 0xFFFFFFFF)))
+
+#menambah satu record ke log deck (file .reviews, hanya ditambah di akhir)
+def log_review(deck_name: str, card_id: str, kind: int, quality: int, prev_interval: float,
+               next_interval: float, latency_ms: int = 0, ts: Optional[int] = None) -> None:
+    append_records(deck_name, pack_review(card_id, kind, quality, prev_interval, next_interval, latency_ms, ts))
+
+#sisa record terpotong (crash saat menulis) dipotong dulu agar record baru tetap sejajar RECORD.size
+def append_records(deck_name: str, data: bytes) -> None:
+    with review_log_path(deck_name).open("ab") as f:
+        torn = f.tell() % RECORD.size
+        if torn:
+            f.truncate(f.tell() - torn)
+        f.write(data)
+
+def read_log_bytes(deck_name: str) -> memoryview:
+    path = review_log_path(deck_name)
+    if not path.exists():
+        return memoryview(b"")
+    data = memoryview(path.read_bytes())
+    #record terakhir yang terpotong (mis. crash saat menulis) diabaikan
+    return data[:len(data) - len(data) % RECORD.size]
+
+def iter_reviews(deck_name: str) -> Iterator[Tuple]:
+    return RECORD.iter_unpack(read_log_bytes(deck_name))
+
+#log sebagai kolom array (tanpa numpy): card berupa list bytes, sisanya array angka
+def load_columns(deck_name: str) -> Dict[str, object]:
+    columns = {"card": [], "ts": array("q"), "kind": array("B"), "quality": array("B"),
+               "prev": array("d"), "next": array("d"), "latency": array("I")}
+    appends = [columns[name].append for name in FIELDS]
+    for record in iter_reviews(deck_name):
+        for append, value in zip(appends, record):
+            append(value)
+    return columns
+
+def review_count(deck_name: str) -> int:
+    path = review_log_path(deck_name)
+    return path.stat().st_size // RECORD.size if path.exists() else 0
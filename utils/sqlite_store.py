@@ -0,0 +1,179 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.deck import to_epoch
+
+#urutan kolom kartu, sama dengan field pada Card
+CARD_FIELDS = ("id", "front", "back", "interval", "ease_factor", "step", "due", "first_time")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    deck TEXT NOT NULL,
+    id TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    interval NUMERIC NOT NULL,
+    ease_factor REAL NOT NULL,
+    step INTEGER NOT NULL,
+    due INTEGER NOT NULL,
+    first_time INTEGER NOT NULL,
+    PRIMARY KEY (deck, id)
+);
+CREATE INDEX IF NOT EXISTS idx_cards_deck_due ON cards (deck, due);
+CREATE INDEX IF NOT EXISTS idx_cards_deck_step ON cards (deck, step);
+CREATE TABLE IF NOT EXISTS limits (
+    deck TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    deck TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+_SELECT = "SELECT id, front, back, interval, ease_factor, step, due, first_time FROM cards"
+
+#mengubah baris sqlite menjadi dict kartu
+def _row_to_card(row) -> Dict:
+    card = dict(zip(CARD_FIELDS, row))
+    card["first_time"] = bool(card["first_time"])
+    return card
+
+def _card_values(deck: str, pos: int, card: Dict) -> tuple:
+    return (deck, card["id"], pos, card["front"], card["back"], card.get("interval", 1),
+            card.get("ease_factor", 2.5), card.get("step", 1), to_epoch(card["due"]),
+            int(bool(card.get("first_time", True))))
+
+class DeckStore:
+    """Penyimpanan deck berbasis SQLite, satu baris per kartu dengan index (deck, due)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            #dipakai juga oleh thread penulis; akses diserialkan oleh lock di utils.deck
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._upgrade(self._conn)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    #database lama menyimpan due sebagai TEXT ISO; tabel dibuat ulang dengan due INTEGER
+    @staticmethod
+    def _upgrade(conn: sqlite3.Connection) -> None:
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(cards)")}
+        if columns.get("due", "INTEGER").upper() == "INTEGER":
+            return
+        conn.create_function("iso_to_epoch", 1, to_epoch)
+        with conn:
+            conn.execute("ALTER TABLE cards RENAME TO cards_old")
+            conn.execute("DROP INDEX IF EXISTS idx_cards_deck_due")
+            conn.execute("DROP INDEX IF EXISTS idx_cards_deck_step")
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "INSERT INTO cards SELECT deck, id, pos, front, back, interval, ease_factor, step, "
+                "iso_to_epoch(due), first_time FROM cards_old")
+            conn.execute("DROP TABLE cards_old")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    #membuka semua kartu deck sesuai urutan penambahan
+    def load_deck(self, deck: str) -> List[Dict]:
+        rows = self.conn.execute(f"{_SELECT} WHERE deck = ? ORDER BY pos", (deck,))
+        return [_row_to_card(r) for r in rows]
+
+    #hanya kartu yang bisa masuk sesi: baru/learning (step < 4) dan review yang sudah jatuh tempo
+    def load_queue_cards(self, deck: str, now_ts: int) -> List[Dict]:
+        select = _SELECT.replace(" FROM", ", pos FROM")
+        rows = self.conn.execute(
+            f"{select} WHERE deck = ? AND step < 4 "
+            f"UNION ALL {select} WHERE deck = ? AND step >= 4 AND due <= ? "
+            "ORDER BY pos",
+            (deck, deck, now_ts),
+        )
+        return [_row_to_card(r[:-1]) for r in rows]
+
+    #menulis ulang seluruh kartu deck
+    def save_deck(self, deck: str, cards: List[Dict]) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM cards WHERE deck = ?", (deck,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_card_values(deck, pos, c) for pos, c in enumerate(cards)),
+            )
+
+    #update satu kartu (satu baris), kartu baru ditambahkan di akhir
+    def save_card(self, deck: str, card: Dict) -> None:
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE cards SET front = ?, back = ?, interval = ?, ease_factor = ?, step = ?, "
+                "due = ?, first_time = ? WHERE deck = ? AND id = ?",
+                _card_values(deck, 0, card)[3:] + (deck, card["id"]),
+            )
+            if cur.rowcount == 0:
+                (pos,) = self.conn.execute(
+                    "SELECT COALESCE(MAX(pos) + 1, 0) FROM cards WHERE deck = ?", (deck,)).fetchone()
+                self.conn.execute("INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                  _card_values(deck, pos, card))
+
+    #metadata deck (lihat utils.deck.deck_meta) dihitung dengan agregat di index (deck, ...)
+    def deck_meta(self, deck: str) -> Dict:
+        total, new, learning, review, new_due, learning_due = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(first_time = 1), 0), "
+            "COALESCE(SUM(first_time = 0 AND step < 4), 0), COALESCE(SUM(first_time = 0 AND step >= 4), 0), "
+            "MIN(CASE WHEN first_time = 1 THEN due END), "
+            "MIN(CASE WHEN first_time = 0 AND step < 4 THEN due END) FROM cards WHERE deck = ?",
+            (deck,)).fetchone()
+        due_days = {str(day): count for day, count in self.conn.execute(
+            "SELECT due / 86400, COUNT(*) FROM cards WHERE deck = ? AND first_time = 0 AND step >= 4 "
+            "GROUP BY due / 86400", (deck,))}
+        return {"cards": total, "new": new, "learning": learning, "review": review,
+                "learning_due": learning_due, "due_days": due_days, "new_due": new_due, "rev": None}
+
+    #limit dari database lama masih menyimpan date sebagai string ISO
+    def load_limit(self, deck: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM limits WHERE deck = ?", (deck,)).fetchone()
+        if row is None:
+            return None
+        limit = json.loads(row[0])
+        if "date" in limit:
+            limit["date"] = to_epoch(limit["date"])
+        return limit
+
+    def save_limit(self, deck: str, limit: Dict) -> None:
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO limits VALUES (?, ?)", (deck, json.dumps(limit)))
+
+    def load_params(self, deck: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM params WHERE deck = ?", (deck,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    #None menghapus parameter, deck kembali memakai default
+    def save_params(self, deck: str, params: Optional[Dict]) -> None:
+        with self.conn:
+            if params is None:
+                self.conn.execute("DELETE FROM params WHERE deck = ?", (deck,))
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO params VALUES (?, ?)", (deck, json.dumps(params)))
+
+    def rename_deck(self, old_name: str, new_name: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE cards SET deck = ? WHERE deck = ?", (new_name, old_name))
+            self.conn.execute("UPDATE limits SET deck = ? WHERE deck = ?", (new_name, old_name))
+            self.conn.execute("UPDATE params SET deck = ? WHERE deck = ?", (new_name, old_name))
+
+    def delete_deck(self, deck: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM cards WHERE deck = ?", (deck,))
+            self.conn.execute("DELETE FROM limits WHERE deck = ?", (deck,))
+            self.conn.execute("DELETE FROM params WHERE deck = ?", (deck,))
@@ -0,0 +1,107 @@
+import bisect
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, Optional
+
+from utils.deck import deck_extras, load_deck, cached_deck, add_save_listener, _locked
+from utils.cards import Card, CardTable, _now_ts
+
+class DeckStats:
+    """Statistik ringkasan deck (total, baru, jatuh tempo, jadwal terdekat, interval), dihitung sekali.
+
+    Setelah dibangun, setiap kartu yang berubah cukup di-remove/add sehingga ringkasan tidak
+    perlu membaca ulang seluruh deck.
+    """
+
+    def __init__(self, due: Iterable[int], interval: Iterable[float], first_time: Iterable[int]):
+        due = list(due)
+        first_time = list(first_time)
+        self.total = len(due)
+        self.new = sum(first_time)
+        self._intervals = Counter(interval)
+        self._interval_sum = sum(v * n for v, n in self._intervals.items())
+        #due semua kartu dan due kartu yang sudah pernah direview, keduanya terurut
+        self._due_all = sorted(due)
+        self._due_seen = sorted(compress(due, [not f for f in first_time]))
+
+    #langsung dari kolom CardTable (array), tanpa membuat objek Card
+    @classmethod
+    def from_table(cls, table: CardTable) -> "DeckStats":
+        return cls(table.due, table.interval, table.first_time)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Dict]) -> "DeckStats":
+        cards = [Card.from_dict(c) for c in cards]
+        return cls((c.due for c in cards), (c.interval for c in cards), (c.first_time for c in cards))
+
+    def add(self, due: int, interval: float, first_time: bool) -> None:
+        self.total += 1
+        self.new += bool(first_time)
+        self._intervals[interval] += 1
+        self._interval_sum += interval
+        bisect.insort(self._due_all, due)
+        if not first_time:
+            bisect.insort(self._due_seen, due)
+
+    def remove(self, due: int, interval: float, first_time: bool) -> None:
+        self.total -= 1
+        self.new -= bool(first_time)
+        self._intervals[interval] -= 1
+        if self._intervals[interval] <= 0:
+            del self._intervals[interval]
+        self._interval_sum -= interval
+        _discard(self._due_all, due)
+        if not first_time:
+            _discard(self._due_seen, due)
+
+    #dict kartu lama (atau None untuk kartu baru) diganti dict kartu baru
+    def replace(self, old: Optional[Dict], card: Dict) -> None:
+        if old is not None:
+            old = Card.from_dict(old)
+            self.remove(old.due, old.interval, old.first_time)
+        card = Card.from_dict(card)
+        self.add(card.due, card.interval, card.first_time)
+
+    #next_review: due terdekat setelah now dari kartu yang sudah pernah direview
+    def summary(self, now: Optional[int] = None) -> Dict:
+        now = _now_ts() if now is None else now
+        due = bisect.bisect_right(self._due_seen, now)
+        return {
+            "total": self.total,
+            "new": self.new,
+            "due": due,
+            "next_due": self._due_all[0] if self._due_all else None,
+            "next_review": self._due_seen[due] if due < len(self._due_seen) else None,
+            "avg_interval": self._interval_sum / self.total if self.total else None,
+            "max_interval": max(self._intervals) if self._intervals else None,
+        }
+
+def _discard(values: list, value) -> None:
+    i = bisect.bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+
+#statistik deck; di jalur json disimpan bersama deck di cache dan ikut diperbarui oleh save_card.
+#dibaca dan diubah di bawah lock deck karena listener bisa jalan di thread penulis (utils.writer)
+@_locked
+def deck_stats(deck_name: str) -> DeckStats:
+    extras = deck_extras(deck_name)
+    if extras is None:
+        return DeckStats.from_cards(load_deck(deck_name))
+    if "deck_stats" not in extras:
+        extras["deck_stats"] = DeckStats.from_table(cached_deck(deck_name).table)
+    return extras["deck_stats"]
+
+#kartu yang disimpan lewat save_card ikut memperbarui statistik yang sudah dibangun
+@_locked
+def _on_card_saved(deck_name: str, old: Optional[Dict], card: Dict) -> None:
+    extras = deck_extras(deck_name)
+    if extras is not None and "deck_stats" in extras:
+        extras["deck_stats"].replace(old, card)
+
+add_save_listener(_on_card_saved)
+
+#semua metrik ringkasan deck sekaligus
+@_locked
+def deck_summary(deck_name: str, now: Optional[int] = None) -> Dict:
+    return deck_stats(deck_name).summary(now)
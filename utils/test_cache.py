@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+import utils.deck as deck
+from utils.deck import (create_deck, save_deck, load_deck, deck_file_path, cache_stats, clear_cache,
+                        set_cache_budget)
+from benchmarks.synthetic import synthetic_cards
+
+NOW = 1_700_000_000
+
+@pytest.fixture(autouse=True)
+def budget():
+    saved = deck.CACHE_BUDGET
+    clear_cache()
+    yield
+    deck.CACHE_BUDGET = saved
+    clear_cache()
+
+def _decks(*names):
+    for name in names:
+        create_deck(name)
+        save_deck(name, synthetic_cards(100, NOW))
+    clear_cache()
+
+def _cost(name):
+    return deck._cache[name]["cost"]
+
+def test_hit_and_miss_counters():
+    _decks("cache-hit")
+    load_deck("cache-hit")
+    load_deck("cache-hit")
+    load_deck("cache-hit")
+    stats = cache_stats()
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 2, 1)
+    assert stats["bytes"] == _cost("cache-hit")
+
+def test_least_recently_used_deck_is_evicted():
+    _decks("lru-a", "lru-b", "lru-c")
+    load_deck("lru-a")
+    load_deck("lru-b")
+    load_deck("lru-a")
+    set_cache_budget(_cost("lru-a") + _cost("lru-b") + _cost("lru-a") // 2)
+    load_deck("lru-c")
+    assert list(deck._cache) == ["lru-a", "lru-c"]
+    assert cache_stats()["evictions"] == 1
+
+def test_set_cache_budget_evicts_immediately_but_keeps_newest():
+    _decks("budget-a", "budget-b")
+    load_deck("budget-a")
+    load_deck("budget-b")
+    set_cache_budget(1)
+    assert list(deck._cache) == ["budget-b"]
+    assert cache_stats()["evictions"] == 1
+
+def test_cost_tracks_card_memory_not_file_size():
+    _decks("cost-small")
+    create_deck("cost-big")
+    save_deck("cost-big", synthetic_cards(1000, NOW))
+    load_deck("cost-small")
+    load_deck("cost-big")
+    assert 9 * _cost("cost-small") < _cost("cost-big") < 11 * _cost("cost-small")
+    assert _cost("cost-big") >= 1000 * deck.EXTRAS_CARD_BYTES
+
+def test_changed_file_invalidates_cache():
+    _decks("stale")
+    cards = load_deck("stale")
+    path = deck_file_path("stale")
+    #isi diganti dengan panjang yang sama, hanya mtime yang berubah
+    edited = dict(cards[0], front=cards[0]["front"][:-1] + "X")
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"cards": [edited] + cards[1:]}, f, indent=2)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert load_deck("stale")[0] == edited
+    #ukuran berubah
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"cards": cards[:10]}, f)
+    assert load_deck("stale") == cards[:10]
+    assert cache_stats()["misses"] == 3
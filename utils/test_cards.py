@@ -0,0 +1,65 @@
+from utils.cards import Card, CardTable
+from benchmarks.synthetic import synthetic_cards
+
+NOW = 1_700_000_000
+
+def test_card_table_round_trips_dicts():
+    cards = synthetic_cards(50, NOW) + [Card.new("depan ✓", "belakang").to_dict()]
+    table = CardTable(cards)
+    assert table.to_dicts() == cards
+    assert table.get(cards[3]["id"]) == Card.from_dict(cards[3])
+
+def test_set_updates_columns_and_text_in_place():
+    cards = synthetic_cards(5, NOW)
+    table = CardTable(cards)
+    rated = dict(cards[1], interval=9, step=4, first_time=False)
+    size = len(table._text)
+    table.set(rated)
+    #rating tidak menambah teks ke buffer
+    assert len(table._text) == size
+    edited = dict(rated, front="baru", back="")
+    table.set(edited)
+    assert table.row(1) == edited
+    assert table.to_dicts() == [cards[0], edited] + cards[2:]
+
+def test_delete_keeps_order_and_positions():
+    cards = synthetic_cards(6, NOW)
+    table = CardTable(cards)
+    assert table.delete(cards[2]["id"])
+    assert not table.delete(cards[2]["id"])
+    assert table.to_dicts() == cards[:2] + cards[3:]
+    assert table.get(cards[5]["id"]) == Card.from_dict(cards[5])
+    table.set(cards[2])
+    assert table.to_dicts()[-1] == cards[2]
+
+def _review_deck(name, dues, new_limit=20, due_limit=100):
+    from utils.deck import create_deck, save_deck, save_limit
+    create_deck(name)
+    save_deck(name, [dict(Card.new(f"{name}-{i}", "b").to_dict(), first_time=False, step=4, interval=3, due=due)
+                     for i, due in enumerate(dues)])
+    save_limit(name, new_limit, due_limit, [new_limit, due_limit])
+
+def test_multi_deck_session_merges_by_due_and_respects_limits():
+    from utils.cards import MultiDeckSession
+    from utils.clock import ManualClock, use_clock
+    now = NOW + 12 * 3600
+    with use_clock(ManualClock(now)):
+        _review_deck("multi-a", [now - 5 * 86400, now - 3 * 86400, now - 60])
+        _review_deck("multi-b", [now - 4 * 86400, now - 2 * 86400, now - 86400, now - 30], due_limit=2)
+        #review baru jatuh tempo lusa: deck tidak perlu dimuat
+        _review_deck("multi-c", [now + 2 * 86400])
+        session = MultiDeckSession(["multi-a", "multi-b", "multi-c"])
+        #hanya review dari hari sebelumnya yang dihitung sebelum deck dimuat
+        assert session.status() == [0, 0, 2 + 2]
+        assert session.estimated()
+        served = []
+        while session:
+            name, card = session.pop()
+            served.append((card.due, name))
+            limit = session.reschedule(name, card, 3)
+        assert not session.estimated()
+        assert served == sorted(served)
+        assert [name for _, name in served] == ["multi-a", "multi-b", "multi-a", "multi-b", "multi-a"]
+        assert limit["due_limit"] == 100 - 3
+        assert session.limits["multi-b"]["due_limit"] == 0
+        assert "multi-c" not in session.sessions
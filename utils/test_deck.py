@@ -0,0 +1,63 @@
+import json
+import random
+
+import utils.deck as deck
+from utils.cards import Card, update_schedule
+from utils.deck import (create_deck, save_deck, save_card, load_deck, checkpoint,
+                        journal_file_path, deck_file_path)
+from benchmarks.synthetic import synthetic_cards
+
+NOW = 1_700_000_000
+
+#state proses dibuang seperti program yang baru dibuka lagi setelah crash
+def _restart():
+    deck.clear_cache()
+    deck._journal_counts.clear()
+    deck._meta.clear()
+
+def _rate(name, rnd, count):
+    for _ in range(count):
+        card = Card.from_dict(rnd.choice(load_deck(name)))
+        update_schedule(card, rnd.randrange(4))
+        save_card(name, card.to_dict())
+
+def test_journal_replayed_after_crash():
+    create_deck("crash")
+    save_deck("crash", synthetic_cards(50, NOW))
+    _rate("crash", random.Random(1), 30)
+    expected = {c["id"]: c for c in load_deck("crash")}
+    #baris terakhir terpotong karena program berhenti saat menulis
+    with journal_file_path("crash").open("a", encoding="utf-8") as f:
+        f.write('{"id": "x", "fro')
+    _restart()
+    assert {c["id"]: c for c in load_deck("crash")} == expected
+
+def test_append_after_torn_line_survives_restart():
+    create_deck("torn")
+    save_deck("torn", synthetic_cards(10, NOW))
+    save_card("torn", dict(load_deck("torn")[0], front="pertama"))
+    with journal_file_path("torn").open("a", encoding="utf-8") as f:
+        f.write('{"id": "x", "fro')
+    _restart()
+    edited = dict(load_deck("torn")[1], front="EDITED")
+    save_card("torn", edited)
+    _restart()
+    cards = load_deck("torn")
+    assert cards[0]["front"] == "pertama"
+    assert cards[1] == edited
+
+def test_checkpoint_compacts_journal(monkeypatch):
+    monkeypatch.setattr(deck, "JOURNAL_CHECKPOINT", 10)
+    create_deck("compact")
+    save_deck("compact", synthetic_cards(20, NOW))
+    _rate("compact", random.Random(2), 25)
+    #25 entri: checkpoint di entri ke-10 dan ke-20, sisa 5 baris di journal
+    with journal_file_path("compact").open(encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 5
+    expected = load_deck("compact")
+    checkpoint("compact")
+    assert not journal_file_path("compact").exists()
+    with deck_file_path("compact").open(encoding="utf-8") as f:
+        assert json.load(f)["cards"] == expected
+    _restart()
+    assert load_deck("compact") == expected
@@ -0,0 +1,50 @@
+import json
+import random
+
+import pytest
+
+import utils.deck as deck
+from utils.cards import Card, update_schedule
+from utils.deck import (create_deck, save_deck, save_card, load_deck, load_index, save_index, deck_meta,
+                        _build_meta, INDEX_FILE)
+from benchmarks.synthetic import synthetic_cards
+
+NOW = 1_700_000_000
+
+def test_incremental_meta_matches_rebuild():
+    create_deck("meta")
+    save_deck("meta", synthetic_cards(300, NOW))
+    deck_meta("meta")
+    rnd = random.Random(3)
+    for _ in range(200):
+        card = Card.from_dict(rnd.choice(load_deck("meta")))
+        update_schedule(card, rnd.randrange(4))
+        save_card("meta", card.to_dict())
+    for _ in range(5):
+        save_card("meta", Card.new("depan", "belakang").to_dict())
+    meta = deck_meta("meta")
+    full = _build_meta(load_deck("meta"), meta["limit"])
+    for key in ("cards", "new", "learning", "review", "due_days"):
+        assert meta[key] == full[key], key
+    #new_due, learning_due dan next_due hanya batas bawah: tidak dinaikkan saat kartu keluar
+    for key in ("new_due", "learning_due", "next_due"):
+        assert full[key] is None or meta[key] <= full[key], key
+
+def test_meta_size_does_not_grow_with_learning_cards():
+    cards = [dict(c, first_time=False, step=2, due=NOW + i) for i, c in enumerate(synthetic_cards(500, NOW))]
+    meta = _build_meta(cards)
+    assert meta["learning"] == 500
+    assert meta["learning_due"] == NOW
+    assert len(json.dumps(meta)) < 500
+
+def test_save_index_is_atomic(monkeypatch):
+    create_deck("atomic")
+    before = INDEX_FILE.read_text(encoding="utf-8")
+    def crash(*args, **kwargs):
+        raise OSError("disk penuh")
+    monkeypatch.setattr(deck.json, "dump", crash)
+    with pytest.raises(OSError):
+        save_index(dict(load_index(), decks=["lain"]))
+    monkeypatch.undo()
+    assert INDEX_FILE.read_text(encoding="utf-8") == before
+    assert "atomic" in load_index()["decks"]
@@ -0,0 +1,23 @@
+from utils.deck import review_log_path
+from utils.reviewlog import RECORD, iter_reviews, log_review, review_count
+
+def test_torn_record_is_truncated_before_append():
+    deck = "log-torn"
+    log_review(deck, "a", 2, 2, 1.0, 3.0, ts=100)
+    #crash di tengah menulis: hanya sebagian record yang sampai ke disk
+    with review_log_path(deck).open("ab") as f:
+        f.write(b"\x01" * (RECORD.size // 2))
+    log_review(deck, "b", 2, 0, 3.0, 1.0, ts=200)
+    log_review(deck, "c", 0, 3, 0.0, 4.0, ts=300)
+    assert review_log_path(deck).stat().st_size == 3 * RECORD.size
+    assert review_count(deck) == 3
+    records = list(iter_reviews(deck))
+    assert [r[1] for r in records] == [100, 200, 300]
+    assert [r[3] for r in records] == [2, 0, 3]
+
+def test_reader_ignores_trailing_partial_record():
+    deck = "log-tail"
+    log_review(deck, "a", 1, 1, 0.0, 1.0, ts=10)
+    with review_log_path(deck).open("ab") as f:
+        f.write(b"\x00" * 5)
+    assert [r[1] for r in iter_reviews(deck)] == [10]
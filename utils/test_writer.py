@@ -0,0 +1,23 @@
+import pytest
+
+from utils.cards import Card
+from utils.deck import create_deck, load_deck, load_limit
+from utils.reviewlog import iter_reviews
+from utils.writer import WriteBehind
+
+@pytest.mark.parametrize("mode", ["sync", "async", "batched"])
+def test_flush_writes_latest_card_and_reviews_in_order(mode):
+    name = f"writer-{mode}"
+    create_deck(name)
+    writer = WriteBehind(mode, batch_size=7)
+    card = Card.new("depan", "belakang")
+    for i in range(25):
+        card.interval = i + 1
+        writer.save_card(name, card.to_dict())
+        writer.log_review(name, card.id, 2, i % 4, i, i + 1, latency_ms=i)
+        writer.save_limit(name, 20 - i % 20, 100, [20, 100])
+    writer.flush()
+    assert writer.pending() == 0
+    assert [c["interval"] for c in load_deck(name)] == [25]
+    assert [r[6] for r in iter_reviews(name)] == list(range(25))
+    assert load_limit(name)["new_limit"] == 20 - 24 % 20
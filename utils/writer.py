@@ -0,0 +1,149 @@
+import atexit
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+from utils.deck import save_card, save_limit
+from utils.reviewlog import RECORD, pack_review, append_records
+
+#mode durability penulisan rating:
+#  sync    - langsung ditulis sebelum kartu berikutnya (perilaku lama)
+#  async   - ditulis thread latar belakang secepatnya
+#  batched - ditulis per BATCH_SIZE rating, sisanya saat flush (akhir sesi / keluar)
+MODES = ("sync", "async", "batched")
+DURABILITY = os.environ.get("MEMORA_DURABILITY", "async").lower()
+BATCH_SIZE = 20
+#maksimal deck yang menunggu ditulis; submit akan menunggu bila antrian penuh
+QUEUE_SIZE = 64
+
+class WriteBehind:
+    """Penulis latar belakang untuk save_card/save_limit/log_review; perubahan yang belum ditulis digabung per deck."""
+
+    def __init__(self, mode: str = DURABILITY, batch_size: int = BATCH_SIZE, maxsize: int = QUEUE_SIZE):
+        if mode not in MODES:
+            raise ValueError(f"Durability mode must be one of {MODES}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        #deck -> {"cards": {id: dict kartu terbaru}, "limit": argumen save_limit terbaru, "reviews": record log}
+        self._pending: Dict[str, Dict] = {}
+        self._queued = set()
+        self._unsent = 0
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def save_card(self, deck_name: str, card: Dict) -> None:
+        if self.mode == "sync":
+            save_card(deck_name, card)
+            return
+        self._submit(deck_name, card=card)
+
+    def save_limit(self, deck_name: str, limit_new: int, limit_due: int, init: list, date: int = 1) -> None:
+        if self.mode == "sync":
+            save_limit(deck_name, limit_new, limit_due, init, date)
+            return
+        self._submit(deck_name, limit=(limit_new, limit_due, init, date))
+
+    #record dibuat saat dipanggil (ts = waktu rating), file log ditulis oleh thread penulis
+    def log_review(self, deck_name: str, card_id: str, kind: int, quality: int, prev_interval: float,
+                   next_interval: float, latency_ms: int = 0) -> None:
+        record = pack_review(card_id, kind, quality, prev_interval, next_interval, latency_ms)
+        if self.mode == "sync":
+            append_records(deck_name, record)
+            return
+        self._submit(deck_name, review=record)
+
+    def _submit(self, deck_name: str, card: Optional[Dict] = None, limit: Optional[tuple] = None,
+                review: Optional[bytes] = None) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(deck_name, {"cards": {}, "limit": None, "reviews": bytearray()})
+            if card is not None:
+                pending["cards"][card["id"]] = card
+            if limit is not None:
+                pending["limit"] = limit
+            if review is not None:
+                pending["reviews"] += review
+            self._unsent += 1
+            wake = self.mode == "async" or self._unsent >= self.batch_size
+        if wake:
+            self._wake()
+
+    #mengirim deck yang punya perubahan ke thread penulis
+    def _wake(self) -> None:
+        with self._lock:
+            names = [n for n in self._pending if n not in self._queued]
+            self._queued.update(names)
+            self._unsent = 0
+        if not names:
+            return
+        self._ensure_thread()
+        for name in names:
+            self._queue.put(name)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="memora-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            name = self._queue.get()
+            try:
+                with self._lock:
+                    self._queued.discard(name)
+                    pending = self._pending.pop(name, None)
+                if pending is not None:
+                    self._write(name, pending)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(deck_name: str, pending: Dict) -> None:
+        for card in pending["cards"].values():
+            save_card(deck_name, card)
+        if pending["limit"] is not None:
+            save_limit(deck_name, *pending["limit"])
+        if pending["reviews"]:
+            append_records(deck_name, bytes(pending["reviews"]))
+
+    #menunggu sampai semua perubahan tertulis ke disk
+    def flush(self) -> None:
+        if self.mode != "sync":
+            self._wake()
+            self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(p["cards"]) + (p["limit"] is not None) + len(p["reviews"]) // RECORD.size
+                       for p in self._pending.values())
+
+_writer: Optional[WriteBehind] = None
+
+#penulis bersama untuk sesi review
+def get_writer() -> WriteBehind:
+    global _writer
+    if _writer is None:
+        _writer = WriteBehind()
+    return _writer
+
+#mengganti mode durability; perubahan yang tertunda ditulis dulu
+def set_durability(mode: str) -> WriteBehind:
+    global _writer
+    if _writer is not None:
+        _writer.flush()
+    _writer = WriteBehind(mode)
+    return _writer
+
+def _flush_at_exit() -> None:
+    if _writer is not None:
+        _writer.flush()
+
+#terdaftar setelah checkpoint_all di utils.deck, jadi dijalankan lebih dulu saat keluar
+atexit.register(_flush_at_exit)